@@ -0,0 +1,119 @@
+"""
+Benchmark: per-frame cost of the FrankHertzMain electron stream against electron count.
+
+Compares the old setup (one VGroup with its own update_electron updater per
+electron) with ElectronStream (one array, one updater). By default only the
+updater step is timed; --render also renders a few seconds of each version
+at low quality and reports wall time per frame. Run from this folder:
+
+    python bench_electrons.py --counts 10 100 1000 [--frames 60] [--render]
+"""
+
+import argparse
+import time
+
+from manim import *
+import numpy as np
+
+from electrons import ElectronStream
+
+CATHODE_CENTER = LEFT * 3.2
+ANODE_POS = ORIGIN
+COLLECTOR_POS = RIGHT * 3
+
+
+def update_electron(electron, dt, voltage):
+    """The per-electron updater FrankHertzMain used before ElectronStream."""
+    if voltage.get_value() == 0:
+        return
+    electron.time_elapsed += dt * voltage.get_value()
+    cycle_time = 3
+    effective_time = (electron.time_elapsed + electron.phase_offset) % cycle_time
+    progress = effective_time / cycle_time
+    accel_phase = 0.5
+    if progress < accel_phase:
+        norm_prog = progress / accel_phase
+        new_pos = electron.start_pos + (ANODE_POS - electron.start_pos) * (norm_prog ** 2)
+    else:
+        norm_prog = (progress - accel_phase) / (1 - accel_phase)
+        new_pos = ANODE_POS + (COLLECTOR_POS - ANODE_POS) * norm_prog
+    electron.move_to(new_pos)
+
+
+def build_per_electron(count, voltage):
+    electrons = VGroup()
+    for _ in range(count):
+        offset = np.array([np.random.uniform(0, 0.7), np.random.uniform(-0.5, 0.6), 0])
+        electron = VGroup(
+            Circle(radius=0.1, color=BLUE, fill_opacity=1),
+            Text("e⁻", font_size=15).move_to(ORIGIN)
+        ).move_to(CATHODE_CENTER + offset)
+        electron.time_elapsed = 0
+        electron.phase_offset = np.random.uniform(0, 5)
+        electron.start_pos = electron.get_center()
+        electron.add_updater(lambda e, dt, volt=voltage: update_electron(e, dt, volt))
+        electrons.add(electron)
+    return electrons
+
+
+def build_stream(count, voltage):
+    offsets = np.column_stack([
+        np.random.uniform(0, 0.7, count),
+        np.random.uniform(-0.5, 0.6, count),
+        np.zeros(count),
+    ])
+    return ElectronStream(CATHODE_CENTER + offsets, np.random.uniform(0, 5, count),
+                          ANODE_POS, COLLECTOR_POS, voltage)
+
+
+BUILDERS = {"per-electron updaters": build_per_electron, "ElectronStream": build_stream}
+
+
+def time_updates(builder, count, frames, dt=1 / 30):
+    voltage = ValueTracker(5)
+    start = time.perf_counter()
+    electrons = builder(count, voltage)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        electrons.update(dt)
+    return build, (time.perf_counter() - start) / frames
+
+
+def time_render(builder, count, seconds):
+    class StreamBench(Scene):
+        def construct(self):
+            voltage = ValueTracker(5)
+            self.add(builder(count, voltage))
+            self.wait(seconds)
+
+    with tempconfig({"quality": "low_quality", "disable_caching": True, "write_to_movie": True,
+                     "verbosity": "ERROR", "output_file": f"StreamBench_{count}"}):
+        scene = StreamBench()
+        start = time.perf_counter()
+        scene.render()
+        elapsed = time.perf_counter() - start
+        frames = int(seconds * config.frame_rate)
+    return elapsed / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--frames", type=int, default=60)
+    parser.add_argument("--render", action="store_true", help="also time full low-quality renders")
+    parser.add_argument("--seconds", type=float, default=2)
+    args = parser.parse_args()
+
+    np.random.seed(0)
+    print(f"{'electrons':>10}  {'version':24s} {'build ms':>10} {'update ms/frame':>16} {'render ms/frame':>16}")
+    for count in args.counts:
+        for name, builder in BUILDERS.items():
+            build, update = time_updates(builder, count, args.frames)
+            render = f"{time_render(builder, count, args.seconds) * 1e3:16.2f}" if args.render else f"{'-':>16}"
+            print(f"{count:>10}  {name:24s} {build * 1e3:10.1f} {update * 1e3:16.3f} {render}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark: build and render cost of the anode hole array against grid density.
+
+Compares the old create_gridded_anode loop (one Circle per hole in a
+VGroup) with one Lattice mobject. Build time is always measured; --render
+also rasterizes a single frame of each with the Cairo camera. Run from
+this folder:
+
+    python bench_lattice.py --sizes 6 20 60 [--render]
+"""
+
+import argparse
+import time
+
+from manim import *
+import numpy as np
+
+from lattice import Lattice, parallelogram_transform
+
+P1, P2, P3, P4 = LEFT * 3 + UP * 0.5, LEFT * 3 + DOWN * 0.5, LEFT * 2.5 + DOWN * 0.2, LEFT * 2.5 + UP * 0.8
+
+
+def build_circles(rows, cols, radius):
+    """The per-hole loop create_gridded_anode used before Lattice."""
+    transform = parallelogram_transform(P1, P2, P3, P4)
+    holes = VGroup()
+    for i in range(rows):
+        for j in range(cols):
+            x = np.linspace(-0.5, 0.5, rows)[i]
+            y = np.linspace(-0.5, 0.5, cols)[j]
+            position = transform(np.array([[x, y, 0.0]]))[0]
+            holes.add(Circle(radius=radius, color=WHITE, fill_opacity=1).move_to(position))
+    return holes
+
+
+def build_lattice(rows, cols, radius):
+    return Lattice(holes=(rows, cols), hole_radius=radius,
+                   transform=parallelogram_transform(P1, P2, P3, P4), color=WHITE)
+
+
+BUILDERS = {"Circle per hole": build_circles, "Lattice": build_lattice}
+
+
+def time_render(mobject, repeats=3):
+    camera = Camera()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        camera.reset()
+        camera.capture_mobjects([mobject])
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[6, 20, 60], help="rows = cols of the hole array")
+    parser.add_argument("--render", action="store_true", help="also time rasterizing one frame")
+    args = parser.parse_args()
+
+    print(f"{'holes':>8}  {'version':16s} {'build ms':>10} {'render ms':>10}")
+    for size in args.sizes:
+        radius = 0.18 / size
+        for name, builder in BUILDERS.items():
+            start = time.perf_counter()
+            mobject = builder(size, size, radius)
+            build = time.perf_counter() - start
+            render = f"{time_render(mobject) * 1e3:10.1f}" if args.render else f"{'-':>10}"
+            print(f"{size * size:>8}  {name:16s} {build * 1e3:10.1f} {render}")
+
+
+if __name__ == "__main__":
+    main()
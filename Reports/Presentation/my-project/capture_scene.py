@@ -0,0 +1,111 @@
+from paths import SRC_DIR  # first: puts the repository's src folder on sys.path
+
+from pathlib import Path
+
+from manim import *
+import numpy as np
+
+from draft import MathTex, Text
+from decimate import minmax_decimate
+from ingest import ingest_sweep
+from pipeline import analyse_sweep
+from results_index import parse_temperature
+
+TRACE_COLORS = (YELLOW, BLUE, GREEN, RED, PURPLE, ORANGE, TEAL, PINK)
+
+
+def axes_transform(axes):
+    """Vectorized coords -> scene points for linear Axes: origin + x * ex + y * ey."""
+    origin = axes.c2p(0, 0)
+    ex, ey = axes.c2p(1, 0) - origin, axes.c2p(0, 1) - origin
+    return lambda x, y: origin + np.outer(x, ex) + np.outer(y, ey)
+
+
+def _nice_range(lo, hi, ticks=6):
+    """Axis range rounded out to a 1/2/5 step giving about `ticks` ticks."""
+    raw = (hi - lo) / ticks if hi > lo else 1.0
+    magnitude = 10 ** np.floor(np.log10(raw))
+    step = min((m * magnitude for m in (1, 2, 5, 10) if m * magnitude >= raw), default=10 * magnitude)
+    return [np.floor(lo / step) * step, np.ceil(hi / step) * step, step]
+
+
+class CaptureScene(Scene):
+    """
+    Animated I(V) curve drawn from real captures.
+
+    Captures (paths relative to src/) go through the cached loader and the
+    analysis pipeline; the dips it finds are marked as the pen passes them.
+    Each trace is decimated to two points per pixel column of the plot
+    before it becomes a VMobject, so the frame cost depends on the screen
+    width, not on the number of samples. Several captures are drawn
+    together as overlays, labelled by temperature.
+    """
+
+    captures = ("140.xlsx",)
+    settings = None         # pipeline.DEFAULT_SETTINGS overrides
+    draw_time = 6
+    columns = None          # decimation width; default: the plot width in pixels
+    title = "Collector current vs accelerating voltage"
+
+    def load(self):
+        """Ingest and analyse the captures; returns the Sweep and the dip table."""
+        sweep = ingest_sweep([SRC_DIR / path for path in self.captures], workers=1)
+        table, _ = analyse_sweep(sweep, self.settings)
+        return sweep, table
+
+    def construct(self):
+        sweep, table = self.load()
+        voltages = [sweep.trace(i, "accelerator_voltage") for i in range(len(sweep))]
+        currents = [sweep.trace(i, "collector_current") for i in range(len(sweep))]
+
+        axes = Axes(
+            x_range=_nice_range(min(v.min() for v in voltages), max(v.max() for v in voltages)),
+            y_range=_nice_range(min(c.min() for c in currents), max(c.max() for c in currents)),
+            x_length=11, y_length=5.5, tips=False,
+            # Tick numbers through draft's MathTex, so draft renders skip LaTeX here too
+            axis_config={"include_numbers": True, "font_size": 20, "label_constructor": MathTex},
+        ).to_edge(DOWN)
+        x_label = Text("Accelerator Voltage (V)", font_size=22).next_to(axes.x_axis, DOWN)
+        y_label = Text("Collector Current", font_size=22).rotate(PI / 2).next_to(axes.y_axis, LEFT)
+        title = Text(self.title, font_size=30).to_edge(UP)
+        self.play(Create(axes), Write(x_label), Write(y_label), Write(title))
+
+        columns = self.columns or int(np.ceil(axes.x_length * config.pixel_width / config.frame_width))
+        x_range = (axes.x_range[0], axes.x_range[1])
+        to_scene = axes_transform(axes)
+        pen = ValueTracker(0)
+
+        curves, legend, markers = VGroup(), VGroup(), []
+        for i, (voltage, current) in enumerate(zip(voltages, currents)):
+            color = TRACE_COLORS[i % len(TRACE_COLORS)]
+            x, y, _ = minmax_decimate(voltage, current, columns, x_range)
+            full = VMobject().set_points_as_corners(to_scene(x, y))
+            drawn = VMobject(stroke_color=color, stroke_width=3)
+            drawn.add_updater(lambda m, full=full: m.pointwise_become_partial(full, 0, pen.get_value()))
+            curves.add(drawn)
+
+            temperature = parse_temperature(sweep.sources[i], sweep.metadata[i])
+            name = f"{temperature:g} °C" if temperature is not None else Path(sweep.sources[i]).stem
+            legend.add(VGroup(Line(ORIGIN, RIGHT * 0.4, color=color), Text(name, font_size=20)).arrange(RIGHT))
+
+            # A dip shows up once the pen is past its voltage column
+            dips = table[table["trace"] == i]
+            for dip in dips:
+                reveal = np.searchsorted(x, dip["voltage"]) / max(len(x) - 1, 1)
+                dot = Dot(to_scene([dip["voltage"]], [dip["current"]])[0], color=RED, radius=0.06)
+                label = Text(f'{dip["voltage"]:.2f}V', font_size=16).next_to(dot, UP, buff=0.1)
+                markers.append((reveal, VGroup(dot, label).set_opacity(0)))
+
+        legend.arrange(DOWN, aligned_edge=LEFT).to_corner(UR).shift(DOWN * 0.6)
+        marker_group = VGroup(*(group for _, group in markers))
+
+        def reveal_markers(group):
+            progress = pen.get_value()
+            for reveal, marker in markers:
+                marker.set_opacity(1 if progress >= reveal else 0)
+
+        marker_group.add_updater(reveal_markers)
+        self.add(curves, marker_group)
+        self.play(FadeIn(legend))
+        self.play(pen.animate.set_value(1), run_time=self.draw_time, rate_func=linear)
+        self.wait(2)
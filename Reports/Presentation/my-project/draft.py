@@ -0,0 +1,90 @@
+"""
+Apply the active render profile inside a manim process.
+
+Scenes import Text, MathTex and ParametricFunction from here instead of
+manim. Normally these are manim's own classes; under a draft profile Text
+and MathTex become placeholder boxes (no Pango or LaTeX run) and
+ParametricFunction samples its curve more coarsely, so timing changes can
+be checked in seconds.
+"""
+
+import os
+
+import manim
+from manim import *
+
+from profiles import get_profile, resolve_ffmpeg
+from svg_cache import HYDRATE_ENV, LocalDirectoryBackend, install_lazy_hydration
+
+PROFILE = get_profile()
+
+
+def apply_profile(profile=PROFILE):
+    """Set manim's resolution, frame rate, caching and ffmpeg path from the profile."""
+    if profile.name != "cfg":
+        config.pixel_width = profile.pixel_width
+        config.pixel_height = profile.pixel_height
+        config.frame_rate = profile.frame_rate
+    if profile.disable_caching:
+        config.disable_caching = True
+    ffmpeg = resolve_ffmpeg()
+    # Only manim versions that shell out to ffmpeg have this setting
+    if ffmpeg and "ffmpeg_executable" in config:
+        config.ffmpeg_executable = ffmpeg
+
+
+class DraftText(VGroup):
+    """Stand-in for Text: one box per character, laid out line by line at about the real size."""
+
+    def __init__(self, text, font_size=DEFAULT_FONT_SIZE, color=WHITE, **kwargs):
+        super().__init__()
+        self.text = text
+        height = 0.4 * font_size / DEFAULT_FONT_SIZE
+        width = 0.6 * height
+        lines = [line.strip() for line in text.strip("\n").splitlines()] or [""]
+        for row, line in enumerate(lines):
+            for column, char in enumerate(line):
+                if not char.isspace():
+                    box = Rectangle(width=0.8 * width, height=height, stroke_width=1,
+                                    color=color, fill_opacity=0.3)
+                    self.add(box.move_to(RIGHT * column * width + DOWN * row * 1.5 * height))
+        if not self.submobjects:
+            self.add(Rectangle(width=width, height=height, stroke_width=0))
+        self.center()
+
+
+class DraftMathTex(VGroup):
+    """Stand-in for MathTex: one bar per tex string, its width following the string length."""
+
+    def __init__(self, *tex_strings, font_size=DEFAULT_FONT_SIZE, color=WHITE, **kwargs):
+        super().__init__()
+        self.tex_strings = tex_strings
+        height = 0.5 * font_size / DEFAULT_FONT_SIZE
+        for tex in tex_strings:
+            bar = Rectangle(width=0.12 * height * max(len(tex), 1), height=height, stroke_width=1,
+                            color=color, fill_opacity=0.3)
+            self.add(bar)
+        self.arrange(RIGHT, buff=0.1)
+
+
+class DraftParametricFunction(manim.ParametricFunction):
+    """ParametricFunction with its sampling step multiplied by the profile's parametric_step_factor."""
+
+    def __init__(self, function, t_range=None, **kwargs):
+        t_range = list(t_range if t_range is not None else (0, 1))
+        if len(t_range) == 2:
+            t_range.append(0.01)  # manim's default step
+        t_range[2] *= PROFILE.parametric_step_factor
+        super().__init__(function, t_range=t_range, **kwargs)
+
+
+if PROFILE.draft:
+    Text, MathTex = DraftText, DraftMathTex
+if PROFILE.parametric_step_factor != 1:
+    ParametricFunction = DraftParametricFunction
+
+apply_profile()
+
+# render.py asks manim processes to fetch compiled SVGs from the shared cache on lookup
+if os.environ.get(HYDRATE_ENV):
+    install_lazy_hydration(LocalDirectoryBackend(os.environ[HYDRATE_ENV]))
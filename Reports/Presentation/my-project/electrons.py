@@ -0,0 +1,164 @@
+from manim import *
+import numpy as np
+
+from glyphs import make_electron
+
+
+def two_phase_positions(start_positions, anode_pos, collector_pos, progress, accel_phase=0.5):
+    """
+    Positions of many electrons along the FrankHertzMain path at once.
+
+    - Acceleration phase: from the start position to the anode (quadratic interpolation)
+    - Constant speed phase: from anode to collector (linear interpolation)
+    `progress` holds one value in [0, 1) per electron.
+    """
+    progress = np.asarray(progress)[:, None]
+    accel = progress < accel_phase
+
+    norm_accel = progress / accel_phase
+    norm_const = (progress - accel_phase) / (1 - accel_phase)
+    accelerating = start_positions + (anode_pos - start_positions) * norm_accel ** 2
+    constant = anode_pos + (collector_pos - anode_pos) * norm_const
+    return np.where(accel, accelerating, constant)
+
+
+class ElectronCloud(VGroup):
+    """
+    Many electrons drawn as one mobject.
+
+    The centres live in a single (n, 3) array. The bodies (circles) and the
+    "e⁻" labels are each one VMobject whose points are a template shape
+    copied to every centre, so moving all electrons is a single broadcast
+    and each part is drawn in one pass, however many electrons there are.
+    """
+
+    def __init__(self, positions, radius=0.1, color=BLUE, label="e⁻", font_size=15, label_color=WHITE, **kwargs):
+        super().__init__(**kwargs)
+        self.positions = np.array(positions, dtype=float).reshape(-1, 3)
+
+        # One electron from the shared glyph cache provides both template shapes
+        body, text = make_electron(ORIGIN, radius=radius, font_size=font_size, color=color, label=label or "e⁻")
+        self._body_template = body.points.copy()
+        self.bodies = VMobject(fill_color=color, fill_opacity=1, stroke_color=color, stroke_width=body.stroke_width)
+        self.add(self.bodies)
+
+        self._label_template = None
+        if label:
+            self._label_template = np.concatenate([m.points for m in text.family_members_with_points()])
+            self.labels = VMobject(fill_color=label_color, fill_opacity=1, stroke_width=0)
+            self.add(self.labels)
+
+        self._refresh()
+
+    @property
+    def num_electrons(self):
+        return len(self.positions)
+
+    def _refresh(self):
+        centres = self.positions[:, None, :]
+        self.bodies.set_points((self._body_template[None] + centres).reshape(-1, 3))
+        if self._label_template is not None:
+            self.labels.set_points((self._label_template[None] + centres).reshape(-1, 3))
+
+    def set_positions(self, positions):
+        """Move every electron at once."""
+        self.positions[...] = positions
+        self._refresh()
+        return self
+
+
+class ElectronStream(ElectronCloud):
+    """
+    ElectronCloud that runs the FrankHertzMain two-phase trajectory for all electrons
+    with one updater per frame.
+
+    Every electron shares one clock scaled by the `voltage` ValueTracker and
+    has its own phase offset, like update_electron did per VGroup.
+    """
+
+    def __init__(self, start_positions, phase_offsets, anode_pos, collector_pos, voltage,
+                 cycle_time=3, accel_phase=0.5, **kwargs):
+        super().__init__(start_positions, **kwargs)
+        self.start_positions = self.positions.copy()
+        self.phase_offsets = np.asarray(phase_offsets, dtype=float)
+        self.anode_pos = np.asarray(anode_pos, dtype=float)
+        self.collector_pos = np.asarray(collector_pos, dtype=float)
+        self.voltage = voltage
+        self.cycle_time = cycle_time
+        self.accel_phase = accel_phase
+        self.time_elapsed = 0.0
+        self.add_updater(ElectronStream.update_stream)
+
+    def update_stream(self, dt):
+        """Advance all electrons by dt; they stay still while the voltage is zero."""
+        voltage = self.voltage.get_value()
+        if voltage == 0:
+            return
+        self.time_elapsed += dt * voltage
+        effective_time = (self.time_elapsed + self.phase_offsets) % self.cycle_time
+        progress = effective_time / self.cycle_time
+        self.set_positions(two_phase_positions(
+            self.start_positions, self.anode_pos, self.collector_pos, progress, self.accel_phase
+        ))
+
+
+def replay_progress(times, positions, t):
+    """
+    Interpolate recorded trajectories at per-electron times `t`.
+
+    times / positions are (n, m) arrays padded with NaN, as recorded by
+    simulation.simulate(record=...); returns one position per row.
+    """
+    times = np.where(np.isnan(times), np.inf, times)
+    t = np.asarray(t, dtype=float)[:, None]
+    rows = np.arange(len(times))
+    lengths = np.isfinite(times).sum(axis=1)
+    i = np.clip((times <= t).sum(axis=1) - 1, 0, lengths - 1)
+    j = np.minimum(i + 1, lengths - 1)
+    t0, t1 = times[rows, i], times[rows, j]
+    weight = np.where(t1 > t0, (t[:, 0] - t0) / np.where(t1 > t0, t1 - t0, 1), 1.0)
+    return positions[rows, i] + (positions[rows, j] - positions[rows, i]) * np.clip(weight, 0, 1)
+
+
+class SimulatedElectronStream(ElectronCloud):
+    """
+    ElectronCloud replaying Monte Carlo trajectories (src/simulation.py).
+
+    Electrons move from their start positions to the anode along the
+    recorded cathode-grid paths, so they slow down in the collisions that
+    excite atoms. Electrons that got through the retarding field continue
+    to the collector at constant speed, the others stop at the anode.
+    Every electron loops over its own trajectory; like ElectronStream, one
+    loop takes `cycle_time` units of the clock scaled by the `speed`
+    ValueTracker.
+    """
+
+    def __init__(self, start_positions, trajectories, anode_pos, collector_pos, speed,
+                 cycle_time=3, tail_fraction=0.3, **kwargs):
+        super().__init__(start_positions, **kwargs)
+        self.start_positions = self.positions.copy()
+        n = self.num_electrons
+        self.times = trajectories.time[:n]
+        self.progress = trajectories.position[:n] / trajectories.gap
+        self.reached = np.asarray(trajectories.reached[:n], dtype=bool)
+        self.anode_pos = np.asarray(anode_pos, dtype=float)
+        self.collector_pos = np.asarray(collector_pos, dtype=float)
+        self.speed = speed
+
+        self.flight_time = np.nanmax(self.times, axis=1)
+        self.tail_time = tail_fraction * self.flight_time
+        self.loop_time = self.flight_time + self.tail_time
+        self.cycle_time = cycle_time
+        self.clock = np.random.uniform(0, 1, n) * self.loop_time  # staggered starts
+        self.add_updater(SimulatedElectronStream.update_stream)
+
+    def update_stream(self, dt):
+        speed = self.speed.get_value()
+        if speed == 0:
+            return
+        self.clock = (self.clock + dt * speed * self.loop_time / self.cycle_time) % self.loop_time
+        in_gap = replay_progress(self.times, self.progress, np.minimum(self.clock, self.flight_time))[:, None]
+        tail = np.clip((self.clock - self.flight_time) / self.tail_time, 0, 1)[:, None] * self.reached[:, None]
+        accelerating = self.start_positions + (self.anode_pos - self.start_positions) * in_gap
+        beyond = self.anode_pos + (self.collector_pos - self.anode_pos) * tail
+        self.set_positions(np.where(self.clock[:, None] < self.flight_time[:, None], accelerating, beyond))
@@ -0,0 +1,210 @@
+"""
+Opt-in frame profiler for the scenes.
+
+Wraps manim's hot paths while a scene renders and records every call as a
+span:
+
+- build:     the scene's own helper methods (create_grid, create_gridded_anode, ...)
+- play:      each self.play / self.wait call
+- animation: Animation.interpolate, per animation type and target
+- updater:   the updaters of each top-level mobject (ElectronStream, ...)
+- raster:    Camera.capture_mobjects (Cairo)
+- encode:    SceneFileWriter.write_frame and the final movie assembly
+- frame:     one rendered frame
+
+Nested spans are fine: the summary charges every span only its self time,
+so a frame's raster time is not counted again under "frame". The spans
+are written as a Chrome trace (open in chrome://tracing or Perfetto) and
+the top offenders are printed. Nothing is patched unless the profiler is
+enabled. Run from this folder:
+
+    python frame_profiler.py FrankHertzMain [--trace trace.json] [--top 20] [--profile draft]
+"""
+
+import argparse
+import functools
+import inspect
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+
+CATEGORIES = ("build", "play", "animation", "updater", "raster", "encode", "frame")
+
+
+class FrameProfiler:
+    """Collects timed spans from patched manim methods; use as a context manager around a render."""
+
+    def __init__(self):
+        self.events = []        # (category, name, start_ns, duration_ns, self_ns)
+        self._stack = []        # child time accumulated for each open span
+        self._patches = []
+        self._plays = 0
+        self.frames = 0
+
+    def span(self, category, name, func, *args, **kwargs):
+        """Call func(*args, **kwargs) and record it as one span."""
+        self._stack.append(0)
+        start = time.perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            duration = time.perf_counter_ns() - start
+            children = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += duration
+            self.events.append((category, name, start, duration, duration - children))
+
+    def _patch(self, owner, attribute, category, name=None):
+        """Replace owner.attribute with a timed wrapper; `name(self, *args)` labels each call."""
+        original = owner.__dict__.get(attribute)
+        if original is None:
+            return
+        profiler = self
+
+        @functools.wraps(original)
+        def timed(obj, *args, **kwargs):
+            label = name(obj, *args) if name else attribute
+            return profiler.span(category, label, original, obj, *args, **kwargs)
+
+        setattr(owner, attribute, timed)
+        self._patches.append((owner, attribute, original))
+
+    def _update_mobjects(self, scene, dt):
+        """Scene.update_mobjects with one updater span per top-level mobject that has updaters."""
+        for mobject in scene.mobjects:
+            if mobject.get_family_updaters():
+                self.span("updater", type(mobject).__name__, mobject.update, dt)
+            else:
+                mobject.update(dt)
+
+    def _play_label(self, scene, *animations):
+        self._plays += 1
+        kinds = [type(getattr(a, "animation", a)).__name__.lstrip("_") for a in animations] or ["wait"]
+        return f"play #{self._plays}: {', '.join(kinds)}"
+
+    def _count_frame(self, original):
+        @functools.wraps(original)
+        def counted(renderer, *args, **kwargs):
+            self.frames += 1
+            return self.span("frame", "frame", original, renderer, *args, **kwargs)
+        return counted
+
+    def enable(self, scene_class=None):
+        from manim.animation.animation import Animation
+        from manim.camera.camera import Camera
+        from manim.renderer.cairo_renderer import CairoRenderer
+        from manim.scene.scene import Scene
+        from manim.scene.scene_file_writer import SceneFileWriter
+
+        self._patch(Scene, "play", "play", self._play_label)
+        self._patch(Scene, "wait", "play", lambda scene, *args: f"wait #{self._plays}")
+        self._patch(Animation, "interpolate", "animation",
+                    lambda anim, *args: f"{type(anim).__name__}({type(anim.mobject).__name__})")
+        self._patch(Camera, "capture_mobjects", "raster")
+        self._patch(SceneFileWriter, "write_frame", "encode")
+        self._patch(SceneFileWriter, "combine_to_movie", "encode")
+        self._patch(SceneFileWriter, "finish", "encode")
+
+        original_update = Scene.__dict__["update_mobjects"]
+        Scene.update_mobjects = lambda scene, dt: self._update_mobjects(scene, dt)
+        self._patches.append((Scene, "update_mobjects", original_update))
+
+        original_render = CairoRenderer.__dict__["render"]
+        CairoRenderer.render = self._count_frame(original_render)
+        self._patches.append((CairoRenderer, "render", original_render))
+
+        # The scene's own helpers, e.g. FrankHertzMain.create_grid
+        if scene_class is not None:
+            for attribute, value in list(vars(scene_class).items()):
+                if inspect.isfunction(value) and not attribute.startswith("_") and attribute != "construct":
+                    self._patch(scene_class, attribute, "build", lambda obj, *a, _n=attribute: _n)
+        return self
+
+    def disable(self):
+        for owner, attribute, original in reversed(self._patches):
+            setattr(owner, attribute, original)
+        self._patches.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.disable()
+
+    def write_trace(self, path):
+        """Write the spans in Chrome's trace event format."""
+        origin = min((start for _, _, start, _, _ in self.events), default=0)
+        events = [{"name": name, "cat": category, "ph": "X", "pid": os.getpid(), "tid": 0,
+                   "ts": (start - origin) / 1e3, "dur": duration / 1e3, "args": {"self_us": own / 1e3}}
+                  for category, name, start, duration, own in self.events]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def summary(self):
+        """Self time per category and per (category, name), in seconds, with call counts."""
+        by_category = defaultdict(float)
+        by_name = defaultdict(lambda: [0, 0.0, 0.0])
+        for category, name, _, duration, own in self.events:
+            by_category[category] += own / 1e9
+            row = by_name[category, name]
+            row[0] += 1
+            row[1] += own / 1e9
+            row[2] = max(row[2], duration / 1e9)
+        return dict(by_category), dict(by_name)
+
+    def print_summary(self, wall, top=15, file=sys.stdout):
+        by_category, by_name = self.summary()
+        frames = max(self.frames, 1)
+        print(f"{self.frames} frames in {wall:.2f} s ({wall / frames * 1e3:.1f} ms/frame)", file=file)
+        print(f"{'category':10s} {'self s':>8} {'share':>6} {'ms/frame':>9}", file=file)
+        for category in CATEGORIES:
+            seconds = by_category.get(category, 0.0)
+            print(f"{category:10s} {seconds:8.3f} {seconds / wall:6.1%} {seconds / frames * 1e3:9.2f}", file=file)
+        other = wall - sum(by_category.values())
+        print(f"{'other':10s} {other:8.3f} {other / wall:6.1%} {other / frames * 1e3:9.2f}", file=file)
+
+        print(f"\ntop {top} by self time", file=file)
+        print(f"{'category':10s} {'name':44s} {'calls':>7} {'self s':>8} {'max ms':>8}", file=file)
+        rows = sorted(by_name.items(), key=lambda item: -item[1][1])[:top]
+        for (category, name), (calls, seconds, longest) in rows:
+            print(f"{category:10s} {name[:44]:44s} {calls:7d} {seconds:8.3f} {longest * 1e3:8.2f}", file=file)
+
+
+def profile_scene(scene_name, trace=None, top=15, module="main"):
+    """Render one scene of `module` with the profiler enabled; returns the profiler."""
+    import importlib
+
+    scene_class = getattr(importlib.import_module(module), scene_name)
+    profiler = FrameProfiler().enable(scene_class)
+    with profiler:
+        start = time.perf_counter()
+        scene_class().render()
+        wall = time.perf_counter() - start
+    if trace:
+        profiler.write_trace(trace)
+    profiler.print_summary(wall, top)
+    return profiler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render a scene with per-frame timing instrumentation.")
+    parser.add_argument("scene", help="scene class in main.py, e.g. FrankHertzMain")
+    parser.add_argument("--trace", default=None, help="Chrome trace JSON to write (default: <scene>.trace.json)")
+    parser.add_argument("--top", type=int, default=15, help="rows in the top-offenders table")
+    parser.add_argument("--profile", help="render profile from manim.cfg (draft, preview, final)")
+    args = parser.parse_args(argv)
+
+    if args.profile:
+        # draft.py reads the profile when main.py imports it
+        from profiles import PROFILE_ENV
+        os.environ[PROFILE_ENV] = args.profile
+    from manim import tempconfig
+    with tempconfig({"disable_caching": True}):
+        profile_scene(args.scene, args.trace or f"{args.scene}.trace.json", args.top)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
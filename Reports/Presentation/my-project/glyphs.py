@@ -0,0 +1,61 @@
+from collections import OrderedDict
+
+from manim import *
+
+from draft import Text
+
+
+class TemplateCache:
+    """
+    Bounded LRU cache of prototype mobjects.
+
+    get() builds a mobject once per key and hands out copies afterwards, so
+    Text / SVG parsing is paid only on the first request. hits and misses
+    count how often a prototype was reused or built.
+    """
+
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._templates = OrderedDict()
+
+    def __len__(self):
+        return len(self._templates)
+
+    def get(self, key, build):
+        """Copy of the cached prototype for `key`, building it with build() on a miss."""
+        template = self._templates.get(key)
+        if template is None:
+            self.misses += 1
+            template = build()
+            self._templates[key] = template
+            if len(self._templates) > self.maxsize:
+                self._templates.popitem(last=False)
+        else:
+            self.hits += 1
+            self._templates.move_to_end(key)
+        return template.copy()
+
+    def clear(self):
+        self._templates.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        return {"size": len(self), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+
+electron_glyphs = TemplateCache(maxsize=32)
+
+
+def make_electron(position=ORIGIN, radius=0.1, font_size=15, color=BLUE, label="e⁻"):
+    """An electron (filled circle with an 'e⁻' label) copied from the shared glyph cache."""
+    def build():
+        return VGroup(
+            Circle(radius=radius, color=color, fill_opacity=1),
+            Text(label, font_size=font_size).move_to(ORIGIN)
+        )
+
+    key = (font_size, radius, str(color), label)
+    return electron_glyphs.get(key, build).move_to(position)
@@ -0,0 +1,99 @@
+from manim import *
+import numpy as np
+
+
+def matrix_transform(matrix):
+    """Transform applying a 3x3 matrix about the origin, like Mobject.apply_matrix."""
+    matrix = np.asarray(matrix, dtype=float)
+    return lambda points: points @ matrix.T
+
+
+def parallelogram_transform(p1, p2, p3, p4):
+    """
+    Map the unit square (-0.5..0.5 in x and y) onto the anode parallelogram.
+
+    Same mapping as create_gridded_anode used per hole: x runs from p1 to p3,
+    y from p2 to p4.
+    """
+    p1, p2, p3, p4 = (np.asarray(p, dtype=float) for p in (p1, p2, p3, p4))
+
+    def transform(points):
+        x_ratio = points[:, 0] + 0.5
+        y_ratio = points[:, 1] + 0.5
+        out = np.zeros_like(points)
+        out[:, 0] = (1 - x_ratio) * p1[0] + x_ratio * p3[0]
+        out[:, 1] = (1 - y_ratio) * p2[1] + y_ratio * p4[1]
+        return out
+    return transform
+
+
+def _as_transform(transform):
+    if transform is None:
+        return lambda points: points
+    if callable(transform):
+        return transform
+    return matrix_transform(transform)
+
+
+def circle_template(radius, n_arcs=8):
+    """Cubic Bezier points (4 per arc) of a circle around the origin."""
+    theta = np.linspace(0, TAU, n_arcs + 1)
+    start, end = theta[:-1], theta[1:]
+    handle = 4 / 3 * np.tan((end - start) / 4) * radius
+    a0 = radius * np.column_stack([np.cos(start), np.sin(start), np.zeros(n_arcs)])
+    a1 = radius * np.column_stack([np.cos(end), np.sin(end), np.zeros(n_arcs)])
+    h0 = a0 + handle[:, None] * np.column_stack([-np.sin(start), np.cos(start), np.zeros(n_arcs)])
+    h1 = a1 - handle[:, None] * np.column_stack([-np.sin(end), np.cos(end), np.zeros(n_arcs)])
+    return np.stack([a0, h0, h1, a1], axis=1).reshape(-1, 3)
+
+
+def wire_points(n_wires, transform=None):
+    """
+    Cubic Bezier points of n_wires horizontal wires across the unit square.
+
+    The wire end points go through `transform` and each wire stays a
+    straight segment between them, which holds for affine and perspective maps.
+    """
+    y = np.linspace(-0.5, 0.5, n_wires)
+    ends = np.zeros((2 * n_wires, 3))
+    ends[0::2, 0], ends[1::2, 0] = -0.5, 0.5
+    ends[:, 1] = np.repeat(y, 2)
+    ends = _as_transform(transform)(ends).reshape(n_wires, 2, 3)
+    t = np.array([0, 1 / 3, 2 / 3, 1])[None, :, None]
+    return (ends[:, :1] + (ends[:, 1:] - ends[:, :1]) * t).reshape(-1, 3)
+
+
+def hole_points(rows, cols, radius, transform=None):
+    """
+    Cubic Bezier points of a rows x cols array of round holes.
+
+    Only the hole centres are transformed, so the holes stay circles.
+    Rows run along x and columns along y, as in create_gridded_anode.
+    """
+    x, y = np.meshgrid(np.linspace(-0.5, 0.5, rows), np.linspace(-0.5, 0.5, cols), indexing="ij")
+    centres = np.column_stack([x.ravel(), y.ravel(), np.zeros(rows * cols)])
+    centres = _as_transform(transform)(centres)
+    return (circle_template(radius)[None] + centres[:, None]).reshape(-1, 3)
+
+
+class Lattice(VMobject):
+    """
+    Grid wires and/or a hole array as a single mobject.
+
+    All wires and holes are subpaths of one point array built in a few
+    array operations, so a denser grid adds points but no mobjects, and the
+    whole lattice is drawn in one pass. `transform` maps the unit square
+    (-0.5..0.5) into the scene: a 3x3 matrix, a callable on (n, 3) point
+    arrays (see parallelogram_transform), or None.
+    """
+
+    def __init__(self, wires=0, holes=(0, 0), hole_radius=0.03, transform=None, color=WHITE, **kwargs):
+        kwargs.setdefault("fill_opacity", 1 if holes[0] * holes[1] else 0)
+        super().__init__(color=color, **kwargs)
+        parts = []
+        if wires:
+            parts.append(wire_points(wires, transform))
+        if holes[0] * holes[1]:
+            parts.append(hole_points(holes[0], holes[1], hole_radius, transform))
+        if parts:
+            self.set_points(np.concatenate(parts))
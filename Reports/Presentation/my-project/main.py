@@ -1,7 +1,23 @@
+import paths  # first: puts the repository's src folder on sys.path
+
 from manim import *
 import numpy as np
 
+from draft import MathTex, ParametricFunction, Text
+from capture_scene import CaptureScene
+from electrons import ElectronStream, SimulatedElectronStream
+from glyphs import make_electron
+from lattice import Lattice, parallelogram_transform
+from simulation import HG_EXCITATION_ENERGY, TubeParameters, simulate
+
 class FrankHertzMain(Scene):
+    num_electrons = 10
+    # Accelerating voltage (V) of a Monte Carlo run to replay instead of the fixed two-phase motion
+    simulated_voltage = None
+    simulated_temperature = 170
+    # Fixed so every render (and every parallel_render.py segment) replays the same trajectories
+    simulation_seed = 0
+
     def construct(self):
         # Step 1: Create the Housing (Vacuum Tube)
         housing = RoundedRectangle(height=3, width=8, corner_radius=1, color=WHITE)
@@ -103,20 +119,35 @@ class FrankHertzMain(Scene):
         self.anode_pos = ORIGIN
         self.collector_pos = RIGHT * 3
         # Step 6: Create Electrons One After Another
-        electrons = VGroup()
-        num_electrons = 10
-
-        for i in range(num_electrons):
-            electron = self.create_electron()
-            electron.time_elapsed = 0
-            electron.phase_offset = np.random.uniform(0, 5)  # Staggered start times
-
-            # Store the starting position for the electron
-            electron.start_pos = electron.get_center()
-
-            electron.add_updater(lambda e, dt, volt=voltage: self.update_electron(e, dt, volt))
-            electrons.add(electron)
-            self.add(electron)
+        # All electrons are one ElectronStream: their positions live in one array
+        # and a single updater moves them every frame
+        num_electrons = self.num_electrons
+        random_offsets = np.column_stack([
+            np.random.uniform(0, 0.7, num_electrons),  # Left-right variation
+            np.random.uniform(-0.5, 0.6, num_electrons),  # Up-down variation
+            np.zeros(num_electrons)
+        ])
+        if self.simulated_voltage:
+            # Replay Monte Carlo paths: electrons stall where they excite Hg atoms
+            result = simulate([self.simulated_voltage], n_particles=num_electrons, record=num_electrons,
+                              params=TubeParameters(temperature_c=self.simulated_temperature),
+                              seed=self.simulation_seed)
+            electrons = SimulatedElectronStream(
+                self.cathode_center + random_offsets,
+                result.trajectories,
+                anode_pos=self.anode_pos,
+                collector_pos=self.collector_pos,
+                speed=voltage,
+            )
+        else:
+            electrons = ElectronStream(
+                self.cathode_center + random_offsets,
+                phase_offsets=np.random.uniform(0, 5, num_electrons),  # Staggered start times
+                anode_pos=self.anode_pos,
+                collector_pos=self.collector_pos,
+                voltage=voltage,
+            )
+        self.add(electrons)
 
 
         # Wait for 5 seconds with stationary electrons
@@ -129,55 +160,6 @@ class FrankHertzMain(Scene):
 
 
 
-    def create_electron(self):
-        """Create an electron at a random position near the cathode."""
-        random_offset = np.array([
-            np.random.uniform(0, 0.7),  # Left-right variation
-            np.random.uniform(-0.5, 0.6),  # Up-down variation
-            0
-        ])
-        start_pos = self.cathode_center + random_offset  # Randomized position
-        electron = VGroup(
-            Circle(radius=0.1, color=BLUE, fill_opacity=1),
-            Text("e⁻", font_size=15).move_to(ORIGIN)
-        )
-        electron.move_to(start_pos)
-        return electron
-    
-
-    def update_electron(self, electron, dt, voltage):
-        """
-        Updater function that continuously moves an electron along a two-phase path:
-        - Acceleration phase: from cathode to anode (quadratic interpolation)
-        - Constant speed phase: from anode to collector (linear interpolation)
-        The electron loops back to the start upon completing a cycle.
-        The speed is controlled by the 'voltage' ValueTracker.
-        """
-        if voltage.get_value() == 0:
-            return  # Stay still if voltage is zero
-        # Increase the custom timer (scaled by the voltage factor)
-        electron.time_elapsed += dt * voltage.get_value()
-        # Define a base cycle time (in seconds) for one complete journey
-        cycle_time = 3  
-        # Use phase_offset to stagger electrons
-        effective_time = (electron.time_elapsed + electron.phase_offset) % cycle_time
-        progress = effective_time / cycle_time
-
-        # Define the fraction of the cycle for acceleration (cathode -> anode)
-        accel_phase = 0.5
-        
-        if progress < accel_phase:
-            # Normalized progress for the acceleration phase (quadratic acceleration)
-            norm_prog = progress / accel_phase
-            new_pos = electron.start_pos + (self.anode_pos - electron.start_pos) * (norm_prog ** 2)
-        else:
-            # Normalized progress for the constant-speed phase (linear motion)
-            norm_prog = (progress - accel_phase) / (1 - accel_phase)
-            new_pos = self.anode_pos + (self.collector_pos - self.anode_pos) * norm_prog
-        
-        electron.move_to(new_pos)
-
-
     def wiggle_electron(self, electron):
         """Wiggle the electron before accelerating."""
         return electron.animate.shift(RIGHT * 0.1).shift(LEFT * 0.1).shift(RIGHT * 0.1)
@@ -192,10 +174,7 @@ class FrankHertzMain(Scene):
     
     def create_electronSimple(self, position):
         """Create an electron as a small circle with 'e⁻' inside."""
-        return VGroup(
-            Circle(radius=0.1, color=BLUE, fill_opacity=1),
-            Text("e⁻", font_size=20).move_to(ORIGIN)
-        ).move_to(position)
+        return make_electron(position, radius=0.1, font_size=20)
         
     def create_gridded_anode(self):
         """Create a gridded anode as a parallelogram with properly aligned holes."""
@@ -214,26 +193,13 @@ class FrankHertzMain(Scene):
         rows, cols = 6, 4  # Adjust for hole density
         hole_radius = 0.03
 
-        # Function to transform points to fit parallelogram
-        def transform_to_parallelogram(x, y):
-            """Transforms a point from a rectangular grid to the parallelogram space."""
-            x_ratio = (x + 0.5)  # Normalize x from (-0.5, 0.5) to (0, 1)
-            y_ratio = (y + 0.5)  # Normalize y from (-0.5, 0.5) to (0, 1)
-
-            # Linearly interpolate x and y within parallelogram edges
-            new_x = (1 - x_ratio) * p1[0] + x_ratio * p3[0]
-            new_y = (1 - y_ratio) * p2[1] + y_ratio * p4[1]
-            return np.array([new_x, new_y, 0])
-
-        # Generate and transform holes
-        holes = VGroup()
-        for i in range(rows):
-            for j in range(cols):
-                x = np.linspace(-0.5, 0.5, rows)[i]  # Normalized x position
-                y = np.linspace(-0.5, 0.5, cols)[j]  # Normalized y position
-                hole_position = transform_to_parallelogram(x, y)  # Apply transformation
-                hole = Circle(radius=hole_radius, color=WHITE, fill_opacity=1).move_to(hole_position)
-                holes.add(hole)
+        # All holes are one Lattice mobject, placed through the parallelogram mapping
+        holes = Lattice(
+            holes=(rows, cols),
+            hole_radius=hole_radius,
+            transform=parallelogram_transform(p1, p2, p3, p4),
+            color=WHITE,
+        )
 
         # Group anode with holes
         gridded_anode = VGroup(anode, holes)
@@ -259,22 +225,21 @@ class FrankHertzMain(Scene):
 
     def create_grid(self):
         """Create a grid of horizontal lines, rotated and skewed for perspective."""
-        lines = VGroup()
-        for y in np.arange(-0.5, 0.6, 0.1):
-            line = Line(LEFT * 0.5, RIGHT * 0.5, color=WHITE).shift(UP * y)
-            lines.add(line)
-    
         # Apply a perspective transformation matrix
         perspective_matrix = np.array([
             [1, 0.1, 0],
             [0.3, 1, 0],
             [0, 0, 1]
         ])
-    
-        lines.apply_matrix(perspective_matrix)
+
+        # All 11 wires are one Lattice mobject (one point array, one draw pass)
+        lines = Lattice(wires=11, transform=perspective_matrix, color=WHITE)
         return lines
 
 
+class FrankHertzSimulated(FrankHertzMain):
+    """FrankHertzMain with the electrons replaying Monte Carlo trajectories (src/simulation.py) at 15 V."""
+    simulated_voltage = 15
 
 
 class SingleCollision(Scene):
@@ -325,38 +290,30 @@ class SingleCollision(Scene):
 
     def create_electronSimple(self, position):
         """Create an electron as a small circle with 'e⁻' inside."""
-        return VGroup(
-            Circle(radius=0.4, color=BLUE, fill_opacity=1),
-            Text("e⁻", font_size=35).move_to(ORIGIN)
-        ).move_to(position)
+        return make_electron(position, radius=0.4, font_size=35)
 
 
 class ChancesAnimation(Scene):
     def construct(self):
-        # Define energy level lines and labels (same as before)...
-        y_0    = -3          
-        y_4_9  = -1          
-        y_9_8  = 1           
-        y_14_7 = 3           
-
-        line0    = Line(LEFT*8 + UP*y_0, RIGHT*8 + UP*y_0, color=WHITE)
-        line4_9  = Line(LEFT*8 + UP*y_4_9, RIGHT*8 + UP*y_4_9, color=YELLOW)
-        line9_8  = Line(LEFT*8 + UP*y_9_8, RIGHT*8 + UP*y_9_8, color=YELLOW)
-        line14_7 = Line(LEFT*8 + UP*y_14_7, RIGHT*8 + UP*y_14_7, color=YELLOW)
-        self.play(Create(line0), Create(line4_9), Create(line9_8), Create(line14_7))
+        # Energy levels n * E_a of mercury on a fixed energy axis: 0 eV at y = -3, 0.4 scene units per eV
+        y_0 = -3
+        units_per_ev = 0.4
+        levels = (1, 2, 3)
+        level_y = [y_0 + n * HG_EXCITATION_ENERGY * units_per_ev for n in levels]
+
+        line0 = Line(LEFT*8 + UP*y_0, RIGHT*8 + UP*y_0, color=WHITE)
+        level_lines = [Line(LEFT*8 + UP*y, RIGHT*8 + UP*y, color=YELLOW) for y in level_y]
+        self.play(Create(line0), *(Create(line) for line in level_lines))
 
         # Energy level labels
         label0 = Text("0 eV", font_size=24).next_to(line0, DOWN)
-        label4_9 = Text("4.9 eV", font_size=24).next_to(line4_9, UP)
-        label9_8 = Text("9.8 eV", font_size=24).next_to(line9_8, UP)
-        label14_7 = Text("14.7 eV", font_size=24).next_to(line14_7, UP)
+        energy_labels = [Text(f"{n * HG_EXCITATION_ENERGY:.1f} eV", font_size=24).next_to(line, UP)
+                         for n, line in zip(levels, level_lines)]
 
         # "n" labels aligned to the left of each line
-        label4_9_n = Text("n=1", font_size=24).move_to(LEFT*6 + UP*(y_4_9+0.4))
-        label9_8_n = Text("n=2", font_size=24).move_to(LEFT*6 + UP*(y_9_8+0.4))
-        label14_7_n = Text("n=3", font_size=24).move_to(LEFT*6 + UP*(y_14_7+0.4))
-        self.play(Write(label0), Write(label4_9), Write(label9_8), Write(label14_7))
-        self.play(Write(label4_9_n), Write(label9_8_n), Write(label14_7_n))
+        n_labels = [Text(f"n={n}", font_size=24).move_to(LEFT*6 + UP*(y+0.4)) for n, y in zip(levels, level_y)]
+        self.play(Write(label0), *(Write(label) for label in energy_labels))
+        self.play(*(Write(label) for label in n_labels))
 
         start_point = LEFT*7 + UP*y_0
         end_point   = RIGHT*7 + UP*y_0
@@ -365,14 +322,10 @@ class ChancesAnimation(Scene):
         all_trails = VGroup()
 
         # Animate trips without fading any lines; preserve each trail.
-        marker_4_9 = self.animate_trip(start_point, end_point, apex_y=y_4_9, run_time=2, color=YELLOW, trail_group=all_trails)
-        self.wait(1)
-
-        marker_9_8 = self.animate_trip(start_point, end_point, apex_y=y_9_8, run_time=2, color=YELLOW, trail_group=all_trails)
-        self.wait(1)
-
-        marker_14_7 = self.animate_trip(start_point, end_point, apex_y=y_14_7, run_time=2, color=YELLOW, trail_group=all_trails)
-        self.wait(2)
+        # One trip per level, with a longer pause after the last one
+        for y, pause in zip(level_y, (1, 1, 2)):
+            self.animate_trip(start_point, end_point, apex_y=y, run_time=2, color=YELLOW, trail_group=all_trails)
+            self.wait(pause)
 
         # Finally, add all trails permanently to the scene
         self.add(all_trails)
@@ -537,3 +490,12 @@ class Introduction(Scene):
         self.play(FadeOut(title), FadeOut(subtitle), FadeOut(intro))
 
 
+class IVCurve(CaptureScene):
+    """The 140 °C measurement drawn from the capture, dips marked as they appear."""
+    captures = ("140.xlsx",)
+
+
+class TemperatureOverlay(CaptureScene):
+    """Several oven temperatures overlaid to show how the curve changes."""
+    captures = ("110.xlsx", "140.xlsx", "155.xlsx", "170.xlsx")
+    title = "I(V) curves at different oven temperatures"
@@ -0,0 +1,213 @@
+"""
+Render one scene frame-parallel over several processes.
+
+Every worker runs the whole scene with the same RNG seeds, so updaters
+and animations go through exactly the same states in every process, but
+only rasterizes and encodes the frames of its own segment of the timeline;
+the other frames only advance the clock, which is cheap next to Cairo and
+the encoder. A first pass counts the frames to split them evenly. The
+segment videos share one encoder setup and are joined with ffmpeg's
+concat demuxer without re-encoding. Run from this folder:
+
+    python parallel_render.py FrankHertzMain --segments 8 [--profile draft] [--seed 0]
+
+Scenes must be deterministic given the seeds (random / numpy.random) and
+must not depend on wall-clock time.
+"""
+
+import argparse
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from profiles import PROFILE_ENV, get_profile, resolve_ffmpeg
+
+HERE = Path(__file__).resolve().parent
+VIDEO_DIR = HERE / "media" / "videos" / "main"
+
+
+def _encoder_command(ffmpeg, width, height, frame_rate, path):
+    """ffmpeg reading raw RGBA frames from stdin; every segment uses the same settings so they concat losslessly."""
+    return [ffmpeg, "-y", "-loglevel", "error",
+            "-f", "rawvideo", "-pix_fmt", "rgba", "-s", f"{width}x{height}", "-r", str(frame_rate), "-i", "-",
+            "-an", "-c:v", "libx264", "-pix_fmt", "yuv420p", "-crf", "18", "-preset", "medium",
+            str(path)]
+
+
+class SegmentRenderer:
+    """
+    Patches manim's Cairo renderer so only frames in [start, end) are drawn.
+
+    Frames are numbered over the whole scene. Frames outside the segment
+    only advance the renderer clock; frames inside are rasterized and piped
+    to ffmpeg. With path=None nothing is written and only the frames are
+    counted.
+    """
+
+    def __init__(self, start=0, end=0, path=None):
+        self.start, self.end, self.path = start, end, path
+        self.frame = 0
+        self.written = 0
+        self._encoder = None
+        self._patches = []
+
+    def _emit(self, renderer, frame, count=1):
+        """Account for `count` identical frames, writing those inside the segment."""
+        first, last = max(self.frame, self.start), min(self.frame + count, self.end)
+        if last > first and self.path is not None:
+            if self._encoder is None:
+                from manim import config
+                command = _encoder_command(resolve_ffmpeg() or "ffmpeg", config.pixel_width, config.pixel_height,
+                                           config.frame_rate, self.path)
+                self._encoder = subprocess.Popen(command, stdin=subprocess.PIPE)
+            data = frame.tobytes()
+            for _ in range(last - first):
+                self._encoder.stdin.write(data)
+            self.written += last - first
+        self.frame += count
+        renderer.time += count / renderer.camera.frame_rate
+
+    def _in_segment(self, count=1):
+        return self.frame < self.end and self.frame + count > self.start
+
+    def __enter__(self):
+        from manim.renderer.cairo_renderer import CairoRenderer
+        segment = self
+
+        # Skipped animations (-n, sections) add no frames and no time, as in CairoRenderer.add_frame
+        def render(renderer, scene, time, moving_mobjects):
+            if renderer.skip_animations:
+                return
+            if segment._in_segment():
+                renderer.update_frame(scene, moving_mobjects)
+                segment._emit(renderer, renderer.get_frame())
+            else:
+                segment._emit(renderer, None)
+
+        def freeze_current_frame(renderer, duration):
+            if renderer.skip_animations:
+                return
+            # Same frame count as manim's own freeze_current_frame
+            dt = 1 / renderer.camera.frame_rate
+            count = int(duration / dt)
+            frame = renderer.get_frame() if segment._in_segment(count) else None
+            segment._emit(renderer, frame, count)
+
+        for name, function in (("render", render), ("freeze_current_frame", freeze_current_frame)):
+            self._patches.append((CairoRenderer, name, CairoRenderer.__dict__[name]))
+            setattr(CairoRenderer, name, function)
+        return self
+
+    def __exit__(self, *exc):
+        for owner, name, original in self._patches:
+            setattr(owner, name, original)
+        if self._encoder is not None:
+            self._encoder.stdin.close()
+            if self._encoder.wait() != 0:
+                raise RuntimeError(f"ffmpeg failed writing {self.path}")
+
+
+def render_segment(scene_name, start, end, path=None, seed=0, profile=None, module="main"):
+    """
+    Worker: run the scene, drawing only frames [start, end) into `path`.
+
+    Returns (total frames in the scene, frames written, seconds).
+    """
+    if profile:
+        os.environ[PROFILE_ENV] = profile
+    import importlib
+    import random
+
+    import numpy as np
+    from manim import tempconfig
+
+    begin = time.perf_counter()
+    random.seed(seed)
+    np.random.seed(seed)
+    scene_class = getattr(importlib.import_module(module), scene_name)
+    settings = {"write_to_movie": False, "save_last_frame": False, "disable_caching": True, "verbosity": "ERROR"}
+    with tempconfig(settings), SegmentRenderer(start, end, path) as segment:
+        scene_class().render()
+    return segment.frame, segment.written, time.perf_counter() - begin
+
+
+def concat_segments(paths, output, ffmpeg=None):
+    """Join segment videos with ffmpeg's concat demuxer, copying the streams (no re-encode)."""
+    ffmpeg = ffmpeg or resolve_ffmpeg() or "ffmpeg"
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as listing:
+        for path in paths:
+            listing.write(f"file '{Path(path).resolve().as_posix()}'\n")
+    try:
+        subprocess.run([ffmpeg, "-y", "-loglevel", "error", "-f", "concat", "-safe", "0",
+                        "-i", listing.name, "-c", "copy", str(output)], check=True)
+    finally:
+        os.unlink(listing.name)
+
+
+def split_frames(n_frames, n_segments):
+    """[start, end) frame ranges of n_segments nearly equal segments."""
+    bounds = [round(i * n_frames / n_segments) for i in range(n_segments + 1)]
+    return [(a, b) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+
+def render_parallel(scene_name, segments=None, seed=0, profile=None, output=None):
+    """Count the frames, render the segments in parallel and join them; returns a timing report."""
+    segments = segments or os.cpu_count()
+    folder = VIDEO_DIR / (get_profile(profile).quality_folder if profile else get_profile("cfg").quality_folder)
+    output = Path(output or folder / f"{scene_name}.mp4")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    report = {"scene": scene_name, "segments": []}
+
+    # spawn: every worker starts with a fresh manim config and module state
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=segments, mp_context=context) as pool:
+        n_frames, _, seconds = pool.submit(render_segment, scene_name, 0, 0, None, seed, profile).result()
+        report["frames"], report["count_seconds"] = n_frames, seconds
+
+        with tempfile.TemporaryDirectory(dir=output.parent) as tmp:
+            ranges = split_frames(n_frames, segments)
+            paths = [Path(tmp) / f"segment_{i:03d}.mp4" for i in range(len(ranges))]
+            start = time.perf_counter()
+            futures = [pool.submit(render_segment, scene_name, a, b, path, seed, profile)
+                       for (a, b), path in zip(ranges, paths)]
+            for (a, b), future in zip(ranges, futures):
+                total, written, seconds = future.result()
+                if total != n_frames or written != b - a:
+                    raise RuntimeError(f"Segment {a}-{b} saw {total} frames (expected {n_frames}) and wrote "
+                                       f"{written}; is the scene deterministic?")
+                report["segments"].append({"frames": (a, b), "seconds": seconds})
+            report["render_seconds"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            concat_segments(paths, output)
+            report["concat_seconds"] = time.perf_counter() - start
+    report["output"] = str(output)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render one scene frame-parallel and join the segments.")
+    parser.add_argument("scene", help="scene class in main.py, e.g. FrankHertzMain")
+    parser.add_argument("--segments", type=int, default=None, help="segments / processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0, help="seed for random and numpy.random in every worker")
+    parser.add_argument("--profile", help="render profile from manim.cfg (draft, preview, final)")
+    parser.add_argument("--output", help="output video (default: media/videos/main/<quality>/<scene>.mp4)")
+    args = parser.parse_args(argv)
+
+    report = render_parallel(args.scene, args.segments, args.seed, args.profile, args.output)
+    print(f"{report['scene']}: {report['frames']} frames, counted in {report['count_seconds']:.1f} s")
+    for segment in report["segments"]:
+        a, b = segment["frames"]
+        print(f"  frames {a:6d}-{b:6d}  {segment['seconds']:8.1f} s")
+    print(f"segments rendered in {report['render_seconds']:.1f} s wall, "
+          f"joined in {report['concat_seconds']:.1f} s -> {report['output']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
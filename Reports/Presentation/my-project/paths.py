@@ -0,0 +1,13 @@
+"""
+Import first: puts the repository's src folder on sys.path.
+
+The scenes use the analysis modules (loaders, dip detection, decimation)
+and the Monte Carlo simulation from src/ directly.
+"""
+
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parents[3] / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
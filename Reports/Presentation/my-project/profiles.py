@@ -0,0 +1,104 @@
+"""
+Render profiles (draft, preview, final) defined in manim.cfg.
+
+A profile is a [profile:<name>] section overriding resolution, frame rate
+and a few switches. It is picked per invocation through the RENDER_PROFILE
+environment variable (render.py --profile sets it for every manim
+process); without one the plain [CLI] settings apply. This module does not
+import manim so render.py can use it; draft.py applies the active profile
+inside the manim process.
+"""
+
+import configparser
+import os
+import shutil
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+CONFIG_FILE = Path(__file__).resolve().parent / "manim.cfg"
+PROFILE_ENV = "RENDER_PROFILE"
+WINDOWS_FFMPEG = r"C:\ffmpeg\ffmpeg.exe"
+
+
+@dataclass
+class Profile:
+    name: str
+    pixel_width: int
+    pixel_height: int
+    frame_rate: int
+    disable_caching: bool = False
+    draft: bool = False
+    parametric_step_factor: float = 1.0
+
+    @property
+    def quality_folder(self):
+        """Folder manim writes this profile's videos to under media/videos/<module>/."""
+        return f"{self.pixel_height}p{self.frame_rate}"
+
+    def manim_args(self):
+        """Command line flags that make a manim process render at this profile's resolution."""
+        args = ["-r", f"{self.pixel_width},{self.pixel_height}", "--fps", str(self.frame_rate)]
+        if self.disable_caching:
+            args.append("--disable_caching")
+        return args
+
+
+def _read_config(config_file=CONFIG_FILE):
+    parser = configparser.ConfigParser()
+    parser.read(config_file)
+    return parser
+
+
+def _profile_from_section(name, section, defaults):
+    return Profile(
+        name=name,
+        pixel_width=section.getint("pixel_width", defaults.getint("pixel_width", 854)),
+        pixel_height=section.getint("pixel_height", defaults.getint("pixel_height", 480)),
+        frame_rate=section.getint("frame_rate", defaults.getint("frame_rate", 30)),
+        disable_caching=section.getboolean("disable_caching", False),
+        draft=section.getboolean("draft", False),
+        parametric_step_factor=section.getfloat("parametric_step_factor", 1.0),
+    )
+
+
+def load_profiles(config_file=CONFIG_FILE):
+    """All profiles in manim.cfg by name; "cfg" is the plain [CLI] settings."""
+    parser = _read_config(config_file)
+    defaults = parser["CLI"] if parser.has_section("CLI") else parser[parser.default_section]
+    profiles = {"cfg": _profile_from_section("cfg", defaults, defaults)}
+    for section in parser.sections():
+        if section.startswith("profile:"):
+            name = section.split(":", 1)[1]
+            profiles[name] = _profile_from_section(name, parser[section], defaults)
+    return profiles
+
+
+def get_profile(name=None, config_file=CONFIG_FILE):
+    """The named profile, or the one in $RENDER_PROFILE, or the [CLI] settings."""
+    name = name or os.environ.get(PROFILE_ENV) or "cfg"
+    profiles = load_profiles(config_file)
+    if name not in profiles:
+        raise ValueError(f"Unknown render profile {name!r}; manim.cfg defines {', '.join(profiles)}")
+    return profiles[name]
+
+
+def resolve_ffmpeg():
+    """
+    Path of an ffmpeg binary, or None.
+
+    Looks at $FFMPEG_BINARY, then PATH, then the binary bundled with
+    imageio-ffmpeg, then the C:\\ffmpeg install the slides were first made with.
+    """
+    candidates = [os.environ.get("FFMPEG_BINARY"), shutil.which("ffmpeg")]
+    try:
+        import imageio_ffmpeg
+        candidates.append(imageio_ffmpeg.get_ffmpeg_exe())
+    except (ImportError, RuntimeError):
+        pass
+    if sys.platform == "win32":
+        candidates.append(WINDOWS_FFMPEG)
+    for path in candidates:
+        if path and os.path.isfile(path):
+            return path
+    return None
@@ -0,0 +1,278 @@
+"""
+Render the presentation scenes concurrently.
+
+Every scene in main.py is rendered by its own manim process, up to
+--workers at a time, so a full rebuild takes about as long as the slowest
+scene instead of the sum of all of them. A scene is skipped when its
+source (class body, the module-level code of main.py, the local helper
+modules and the analysis modules they import from src), its capture data
+files and the render configuration hash to the same value as the last
+successful render and the video is still under
+media/videos/main/<quality>. Run from this folder:
+
+    python render.py                       # all scenes, manim.cfg quality
+    python render.py -q h --workers 3      # 1080p60
+    python render.py FrankHertzMain --force
+    python render.py FrankHertzMain --profile draft   # placeholders, 240p15
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from paths import SRC_DIR
+from profiles import PROFILE_ENV, get_profile
+from svg_cache import HYDRATE_ENV, LocalDirectoryBackend, publish
+
+HERE = Path(__file__).resolve().parent
+SCENE_FILE = HERE / "main.py"
+CONFIG_FILE = HERE / "manim.cfg"
+VIDEO_DIR = HERE / "media" / "videos" / SCENE_FILE.stem
+HASH_FILE = "render_hashes.json"
+
+# Local modules the scenes depend on; a change in any of them re-renders every scene
+DEPENDENCIES = ("paths.py", "electrons.py", "glyphs.py", "draft.py", "profiles.py", "lattice.py", "capture_scene.py",
+                *(f"../../../src/{name}.py" for name in (
+                    "simulation", "scope_loader", "decimate", "capture_cache", "ingest", "preprocess",
+                    "smoothing", "dips", "fitting", "pipeline", "results_index")))
+
+# CaptureScene attribute listing the capture files (relative to src/) a scene draws
+CAPTURES_ATTRIBUTE = "captures"
+
+# Base classes that make a class in main.py a renderable scene
+SCENE_BASES = {"Scene", "MovingCameraScene", "ThreeDScene", "CaptureScene"}
+
+# manim's -q flags and the folder each one renders into
+QUALITIES = {"l": "480p15", "m": "720p30", "h": "1080p60", "p": "1440p60", "k": "2160p60"}
+
+
+def scene_sources(path=SCENE_FILE):
+    """
+    Map every Scene subclass in `path` to its source, plus the module-level code shared by all of them.
+
+    Subclasses of scenes defined earlier in the file (FrankHertzSimulated of
+    FrankHertzMain) are scenes too; their source includes their parents'.
+    """
+    text = path.read_text(encoding="utf-8")
+    tree = ast.parse(text)
+    scenes, shared = {}, []
+    for node in tree.body:
+        segment = ast.get_source_segment(text, node)
+        bases = {getattr(base, "id", getattr(base, "attr", None)) for base in getattr(node, "bases", [])}
+        if isinstance(node, ast.ClassDef) and bases & (SCENE_BASES | set(scenes)):
+            scenes[node.name] = "\n".join([scenes[base] for base in sorted(bases & set(scenes))] + [segment])
+        else:
+            shared.append(segment)
+    return scenes, "\n".join(shared)
+
+
+def _class_captures(node):
+    """Literal value of a `captures = (...)` assignment in a class body, or None."""
+    for statement in node.body:
+        if isinstance(statement, ast.Assign) and any(
+                getattr(target, "id", None) == CAPTURES_ATTRIBUTE for target in statement.targets):
+            return tuple(ast.literal_eval(statement.value))
+    return None
+
+
+def scene_captures(path=SCENE_FILE):
+    """Map every CaptureScene subclass in `path` to the capture files it loads (paths under src/)."""
+    default_file = HERE / "capture_scene.py"
+    default = ()
+    for node in ast.parse(default_file.read_text(encoding="utf-8")).body:
+        if isinstance(node, ast.ClassDef) and node.name == "CaptureScene":
+            default = _class_captures(node) or ()
+
+    captures = {}
+    for node in ast.parse(path.read_text(encoding="utf-8")).body:
+        bases = {getattr(base, "id", getattr(base, "attr", None)) for base in getattr(node, "bases", [])}
+        if isinstance(node, ast.ClassDef) and "CaptureScene" in bases:
+            own = _class_captures(node)
+            captures[node.name] = own if own is not None else default
+    return captures
+
+
+def quality_folder(quality=None, profile=None):
+    """Folder name manim renders into: <height>p<fps> from the -q flag, a profile or manim.cfg."""
+    if quality:
+        return QUALITIES[quality]
+    return get_profile(profile or "cfg").quality_folder
+
+
+def scene_hashes(scenes, shared, render_args, captures=None):
+    """
+    Hash of each scene's source together with everything else that changes its video.
+
+    captures maps scene names to the data files (under src/) they draw, which
+    are hashed into those scenes only.
+    """
+    common = hashlib.sha256()
+    common.update(shared.encode())
+    for name in DEPENDENCIES:
+        path = HERE / name
+        if path.exists():
+            common.update(path.read_bytes())
+    if CONFIG_FILE.exists():
+        common.update(CONFIG_FILE.read_bytes())
+    common.update(json.dumps(render_args).encode())
+
+    hashes = {}
+    for name, source in scenes.items():
+        digest = common.copy()
+        digest.update(source.encode())
+        for capture in (captures or {}).get(name, ()):
+            path = SRC_DIR / capture
+            digest.update(capture.encode())
+            if path.exists():
+                digest.update(path.read_bytes())
+        hashes[name] = digest.hexdigest()
+    return hashes
+
+
+def load_hashes(folder):
+    try:
+        with open(folder / HASH_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_hashes(folder, hashes):
+    folder.mkdir(parents=True, exist_ok=True)
+    tmp = folder / (HASH_FILE + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(hashes, f, indent=1, sort_keys=True)
+    os.replace(tmp, folder / HASH_FILE)
+
+
+def manim_command(scene, quality=None, extra_args=(), profile=None):
+    command = [sys.executable, "-m", "manim", "render"]
+    if quality:
+        command.append(f"-q{quality}")
+    if profile:
+        command += get_profile(profile).manim_args()
+    return command + list(extra_args) + [SCENE_FILE.name, scene]
+
+
+def render_scene(scene, quality=None, extra_args=(), profile=None, svg_cache=None):
+    """
+    Render one scene in its own manim process; returns (returncode, seconds, stderr tail).
+
+    With an `svg_cache` backend the process fetches compiled SVGs from it as
+    manim looks them up (svg_cache.install_lazy_hydration, via draft.py).
+    """
+    env = dict(os.environ)
+    if profile:
+        env[PROFILE_ENV] = profile
+    if svg_cache is not None:
+        env[HYDRATE_ENV] = str(svg_cache.root)
+    start = time.perf_counter()
+    result = subprocess.run(manim_command(scene, quality, extra_args, profile), cwd=HERE,
+                            capture_output=True, text=True, env=env)
+    elapsed = time.perf_counter() - start
+    return result.returncode, elapsed, result.stderr[-2000:]
+
+
+def render_all(names=None, workers=None, quality=None, force=False, extra_args=(), dry_run=False, profile=None,
+               svg_cache=None, record_hashes=True):
+    """
+    Render the requested scenes (all by default) with up to `workers` manim processes.
+
+    `profile` names a render profile from manim.cfg (see profiles.py); it
+    takes the place of `quality`. With an `svg_cache` backend (see
+    svg_cache.py) the manim processes take the compiled MathTex/Text SVGs
+    they look up from it, and new ones are added afterwards. With record_hashes=False
+    successful renders are not recorded as up to date, for passes that do
+    not write the real videos (e.g. manim's --dry_run).
+
+    Returns one dict per scene with its status ("rendered", "skipped",
+    "failed", "pending" for a dry run) and wall time.
+    """
+    scenes, shared = scene_sources()
+    names = list(names or scenes)
+    unknown = [name for name in names if name not in scenes]
+    if unknown:
+        raise ValueError(f"Unknown scene(s): {', '.join(unknown)}; main.py defines {', '.join(scenes)}")
+
+    folder = VIDEO_DIR / quality_folder(quality, profile)
+    hashes = scene_hashes(scenes, shared, {"quality": quality, "profile": profile, "args": list(extra_args)},
+                          scene_captures())
+    previous = load_hashes(folder)
+
+    results, todo = {}, []
+    for name in names:
+        up_to_date = previous.get(name) == hashes[name] and (folder / f"{name}.mp4").exists()
+        if up_to_date and not force:
+            results[name] = {"scene": name, "status": "skipped", "seconds": 0.0}
+        else:
+            todo.append(name)
+    if dry_run:
+        results.update({name: {"scene": name, "status": "pending", "seconds": 0.0} for name in todo})
+        return [results[name] for name in names]
+
+    # Each scene is a separate manim process; threads only wait on them
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        futures = {pool.submit(render_scene, name, quality, extra_args, profile, svg_cache): name for name in todo}
+        for future in as_completed(futures):
+            name = futures[future]
+            returncode, seconds, stderr = future.result()
+            status = "rendered" if returncode == 0 else "failed"
+            results[name] = {"scene": name, "status": status, "seconds": seconds}
+            if returncode != 0:
+                results[name]["error"] = stderr
+            elif record_hashes:
+                # Record right away so an interrupted rebuild keeps finished scenes
+                previous[name] = hashes[name]
+                save_hashes(folder, previous)
+            print(f"  {name:20s} {status:8s} {seconds:8.1f} s", file=sys.stderr)
+
+    if svg_cache is not None and todo:
+        publish(svg_cache)
+    return [results[name] for name in names]
+
+
+def print_report(results, wall):
+    print(f"{'scene':20s} {'status':8s} {'wall s':>8}")
+    for row in results:
+        print(f"{row['scene']:20s} {row['status']:8s} {row['seconds']:8.1f}")
+    busy = sum(row["seconds"] for row in results)
+    print(f"total wall time {wall:.1f} s, sum of scene times {busy:.1f} s")
+    for row in results:
+        if row["status"] == "failed":
+            print(f"\n{row['scene']} failed:\n{row['error']}", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render the presentation scenes in parallel.")
+    parser.add_argument("scenes", nargs="*", help="scenes to render (default: all scenes in main.py)")
+    parser.add_argument("--workers", type=int, default=None, help="concurrent manim processes (default: all cores)")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("-q", "--quality", choices=QUALITIES, help="manim quality flag (default: manim.cfg)")
+    group.add_argument("--profile", help="render profile from manim.cfg: draft, preview or final")
+    parser.add_argument("--force", action="store_true", help="render even if nothing changed")
+    parser.add_argument("--no-svg-cache", action="store_true",
+                        help="do not share compiled MathTex/Text SVGs through svg_cache.py")
+    parser.add_argument("--dry-run", action="store_true", help="only list which scenes would be rendered")
+    parser.add_argument("--list", action="store_true", help="list the scenes in main.py and exit")
+    args, extra_args = parser.parse_known_args(argv)
+
+    if args.list:
+        print("\n".join(scene_sources()[0]))
+        return 0
+
+    start = time.perf_counter()
+    results = render_all(args.scenes, args.workers, args.quality, args.force, extra_args, args.dry_run,
+                         args.profile, None if args.no_svg_cache else LocalDirectoryBackend())
+    print_report(results, time.perf_counter() - start)
+    return int(any(row["status"] == "failed" for row in results))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,275 @@
+"""
+Shared cache for the SVGs manim compiles from MathTex and Text.
+
+manim names every compiled SVG after a hash of its input (the LaTeX source
+with its template, or the text with its font settings) and skips the
+compilation when that file already exists in media/Tex or media/texts.
+That folder is per checkout, so every fresh clone or CI container pays the
+LaTeX runs again. This module keeps the SVGs in a content-addressed store
+outside the project. During a render each manim process fetches an SVG from
+the store the moment manim looks it up, so only the files the scene needs
+are copied into the media folder (see install_lazy_hydration); afterwards
+the new ones are added ("publish"). "hydrate" copies the whole store.
+
+The store is a backend object with get/put/keys/delete; LocalDirectoryBackend
+keeps entries as files in a directory with size-based LRU eviction. A
+directory on a shared mount serves several machines.
+
+    python svg_cache.py warm [scenes...] [--workers N]   # precompile every scene
+    python svg_cache.py benchmark [scenes...]             # cold vs warm build time
+    python svg_cache.py stats | hydrate | publish | clear
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+MEDIA_DIR = HERE / "media"
+DEFAULT_CACHE_DIR = Path(os.environ.get("MANIM_SVG_CACHE", Path.home() / ".cache" / "frank-hertz-svg"))
+DEFAULT_MAX_BYTES = 512 * 2 ** 20
+
+# media sub-folders holding compiled SVGs: MathTex/Tex and Text/MarkupText
+KINDS = ("Tex", "texts")
+
+# Set to a cache directory, manim processes (through draft.py) fetch SVGs from it on lookup
+HYDRATE_ENV = "SVG_CACHE_HYDRATE"
+
+
+class LocalDirectoryBackend:
+    """
+    Cache entries as files under `root`, evicting least recently used ones above `max_bytes`.
+
+    Keys look like "Tex/0f3251867750cfb5.svg". Reading an entry refreshes
+    its modification time, which is what eviction orders by.
+    """
+
+    def __init__(self, root=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key):
+        return self.root / key
+
+    def get(self, key):
+        """Entry contents, or None when it is not cached."""
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            self.misses += 1
+            return None
+        os.utime(path)
+        self.hits += 1
+        return data
+
+    def put(self, key, data):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write under a temporary name so concurrent readers never see half a file
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def __contains__(self, key):
+        return self._path(key).exists()
+
+    def keys(self):
+        return [path.relative_to(self.root).as_posix() for kind in KINDS
+                for path in (self.root / kind).glob("*.svg")]
+
+    def delete(self, key):
+        self._path(key).unlink(missing_ok=True)
+
+    def size(self):
+        return sum(self._path(key).stat().st_size for key in self.keys())
+
+    def evict(self, max_bytes=None):
+        """Drop the least recently used entries until the cache fits in max_bytes."""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        entries = sorted((path.stat().st_mtime, path.stat().st_size, key)
+                         for key in self.keys() for path in [self._path(key)])
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, key in entries:
+            if total <= max_bytes:
+                break
+            self.delete(key)
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self):
+        for key in self.keys():
+            self.delete(key)
+        self.hits = 0
+        self.misses = 0
+
+
+def media_entries(media_dir=MEDIA_DIR):
+    """Cache keys and paths of the compiled SVGs in a media folder."""
+    media_dir = Path(media_dir)
+    return {f"{kind}/{path.name}": path for kind in KINDS for path in (media_dir / kind).glob("*.svg")}
+
+
+def hydrate(backend, media_dir=MEDIA_DIR):
+    """Copy cached SVGs missing from the media folder into it; returns the number copied."""
+    media_dir = Path(media_dir)
+    present = media_entries(media_dir)
+    copied = 0
+    for key in backend.keys():
+        if key in present:
+            continue
+        data = backend.get(key)
+        if data is None:
+            continue
+        target = media_dir / key
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(data)
+        copied += 1
+    return copied
+
+
+def fetch(backend, key, target):
+    """Copy one cached SVG to `target` unless it is already there; returns True if `target` exists afterwards."""
+    target = Path(target)
+    if target.exists():
+        return True
+    data = backend.get(key)
+    if data is None:
+        return False
+    target.parent.mkdir(parents=True, exist_ok=True)
+    # Parallel manim processes may fetch the same file; never expose half of it
+    fd, tmp = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(tmp, target)
+    return True
+
+
+def install_lazy_hydration(backend):
+    """
+    Inside a manim process: fetch each compiled SVG from `backend` when manim looks it up.
+
+    manim names the SVG of a MathTex after its .tex file (generate_tex_file)
+    and the SVG of a Text after _text2hash, then only compiles when that file
+    is missing. Wrapping those two lookups copies just the SVGs the scene
+    uses, instead of the whole cache, into whichever media folder is active.
+    """
+    from manim import config
+    from manim.mobject.text import text_mobject
+    from manim.utils import tex_file_writing
+
+    generate_tex_file = tex_file_writing.generate_tex_file
+
+    def generate_tex_file_cached(*args, **kwargs):
+        tex_file = Path(generate_tex_file(*args, **kwargs))
+        fetch(backend, f"Tex/{tex_file.stem}.svg", tex_file.with_suffix(".svg"))
+        return tex_file
+
+    tex_file_writing.generate_tex_file = generate_tex_file_cached
+
+    for cls in (text_mobject.Text, text_mobject.MarkupText):
+        def text2hash(self, color, _text2hash=cls.__dict__["_text2hash"]):
+            name = _text2hash(self, color)
+            fetch(backend, f"texts/{name}.svg", Path(config.get_dir("text_dir")) / f"{name}.svg")
+            return name
+        cls._text2hash = text2hash
+
+
+def publish(backend, media_dir=MEDIA_DIR):
+    """Add the media folder's SVGs that the cache does not have yet, then evict; returns the number added."""
+    added = 0
+    for key, path in media_entries(media_dir).items():
+        if key not in backend:
+            backend.put(key, path.read_bytes())
+            added += 1
+    backend.evict()
+    return added
+
+
+def warm(backend, scenes=None, workers=None):
+    """
+    Precompile the MathTex/Text of every scene into the cache.
+
+    Runs the scenes through render.py with manim's --dry_run, which builds
+    every mobject (and so compiles every SVG) without writing any video.
+    The dry runs are not recorded in render.py's hashes, so the next real
+    render still sees which videos are out of date.
+    """
+    import render
+
+    before = set(backend.keys())
+    results = render.render_all(scenes, workers=workers, force=True, extra_args=["--dry_run"],
+                                svg_cache=backend, record_hashes=False)
+    return results, len(set(backend.keys()) - before)
+
+
+def benchmark(backend, scenes=None):
+    """
+    Build time of each scene with an empty media folder (cold) and one fetching from the cache (warm).
+
+    Both passes are dry runs into throw-away media folders, so the
+    project's own media folder is left alone.
+    """
+    import render
+
+    names = list(scenes or render.scene_sources()[0])
+    rows = []
+    for name in names:
+        timings = {}
+        for mode in ("cold", "warm"):
+            with tempfile.TemporaryDirectory() as media_dir:
+                start = time.perf_counter()
+                returncode, _, stderr = render.render_scene(name, extra_args=["--dry_run", "--media_dir", media_dir],
+                                                            svg_cache=backend if mode == "warm" else None)
+                timings[mode] = time.perf_counter() - start
+                if returncode != 0:
+                    raise RuntimeError(f"{name} failed:\n{stderr}")
+                if mode == "cold":
+                    publish(backend, media_dir)
+        rows.append({"scene": name, **timings})
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Shared cache of compiled MathTex/Text SVGs.")
+    parser.add_argument("command", choices=("warm", "benchmark", "hydrate", "publish", "stats", "clear"))
+    parser.add_argument("scenes", nargs="*", help="scenes for warm/benchmark (default: all)")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="cache directory (default: $MANIM_SVG_CACHE)")
+    parser.add_argument("--max-bytes", type=int, default=DEFAULT_MAX_BYTES)
+    parser.add_argument("--workers", type=int, default=None, help="parallel scenes for warm")
+    args = parser.parse_args(argv)
+
+    backend = LocalDirectoryBackend(args.cache_dir, args.max_bytes)
+    if args.command == "warm":
+        start = time.perf_counter()
+        results, added = warm(backend, args.scenes, args.workers)
+        failed = [row["scene"] for row in results if row["status"] == "failed"]
+        print(f"{added} SVGs added in {time.perf_counter() - start:.1f} s"
+              + (f"; failed: {', '.join(failed)}" if failed else ""))
+        return int(bool(failed))
+    if args.command == "benchmark":
+        print(f"{'scene':20s} {'cold s':>8} {'warm s':>8} {'speedup':>8}")
+        for row in benchmark(backend, args.scenes):
+            print(f"{row['scene']:20s} {row['cold']:8.2f} {row['warm']:8.2f} {row['cold'] / row['warm']:7.1f}x")
+    elif args.command == "hydrate":
+        print(f"{hydrate(backend)} SVGs copied into {MEDIA_DIR}")
+    elif args.command == "publish":
+        print(f"{publish(backend)} SVGs added to {backend.root}")
+    elif args.command == "stats":
+        keys = backend.keys()
+        print(f"{backend.root}: {len(keys)} SVGs, {backend.size() / 2 ** 20:.1f} MiB of {args.max_bytes / 2 ** 20:.0f} MiB")
+    elif args.command == "clear":
+        backend.clear()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
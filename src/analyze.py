@@ -0,0 +1,193 @@
+"""
+Headless batch analysis of a directory of captures.
+
+    load -> preprocess -> detect -> fit -> report
+
+Runs without a notebook kernel or display, e.g. as a scheduled job:
+
+    python analyze.py path/to/sweep --workers 8 --format csv --output results/
+    python analyze.py . --figures figures/ --index results.sqlite
+
+Figures are only drawn when --figures is given, through matplotlib's Agg
+backend, one PNG per capture.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from capture_cache import DEFAULT_CACHE_DIR, json_default
+from dips import dips_to_frame
+from ingest import find_captures, ingest_sweep
+from pipeline import DEFAULT_SETTINGS, analyse_sweep, resolve_settings
+from results_index import ResultsIndex, parse_temperature
+
+FORMATS = ("table", "csv", "json")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Batch Frank-Hertz analysis of a directory of captures.")
+    parser.add_argument("directory", help="directory with checkN.csv / NNN.xlsx captures")
+    parser.add_argument("--pattern", action="append", help="file pattern(s) to pick up (default: *.csv, *.xlsx)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes for ingest and dip detection (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=64,
+                        help="captures ingested and analysed per batch, bounds memory (default: 64)")
+    parser.add_argument("--format", choices=FORMATS, default="table", help="report format (default: table)")
+    parser.add_argument("--output", help="directory for the reports (default: print to stdout)")
+    parser.add_argument("--figures", help="write one PNG per capture into this directory")
+    parser.add_argument("--index", help="SQLite results index; unchanged captures are not re-analysed")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="parsed capture cache directory")
+
+    group = parser.add_argument_group("analysis settings")
+    group.add_argument("--smoothing", choices=("none", "boxcar", "savgol", "lowpass"),
+                       default=DEFAULT_SETTINGS["smoothing"])
+    group.add_argument("--smooth-window", type=int, default=DEFAULT_SETTINGS["smooth_window"])
+    group.add_argument("--cutoff", type=float, default=DEFAULT_SETTINGS["cutoff"])
+    group.add_argument("--exclude-ends", type=int, default=DEFAULT_SETTINGS["exclude_ends"])
+    group.add_argument("--invert", action="store_true", help="detect minima of the current instead of maxima")
+    group.add_argument("--distance", type=int, default=DEFAULT_SETTINGS["distance"])
+    group.add_argument("--prominence", type=float, default=DEFAULT_SETTINGS["prominence"])
+    group.add_argument("--width", type=float, default=DEFAULT_SETTINGS["width"])
+    group.add_argument("--refine", choices=("none", "parabolic", "gaussian"), default=DEFAULT_SETTINGS["refine"])
+    group.add_argument("--first-dip-order", type=int, default=DEFAULT_SETTINGS["first_dip_order"])
+    group.add_argument("--tube-length", type=float, default=DEFAULT_SETTINGS["tube_length"])
+    return parser
+
+
+def settings_from_args(args):
+    return resolve_settings({
+        "smoothing": None if args.smoothing == "none" else args.smoothing,
+        "smooth_window": args.smooth_window,
+        "cutoff": args.cutoff,
+        "exclude_ends": args.exclude_ends,
+        "invert": args.invert,
+        "distance": args.distance,
+        "prominence": args.prominence,
+        "width": args.width,
+        "refine": None if args.refine == "none" else args.refine,
+        "first_dip_order": args.first_dip_order,
+        "tube_length": args.tube_length,
+    })
+
+
+def save_figures(sweep, table, directory):
+    """One PNG per capture with its dips marked, drawn off-screen with the Agg backend."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    os.makedirs(directory, exist_ok=True)
+    for i, source in enumerate(sweep.sources):
+        name = os.path.splitext(os.path.basename(source))[0]
+        dips = table[table["trace"] == i]
+        fig, ax = plt.subplots(figsize=(15, 6))
+        ax.plot(sweep.trace(i, "accelerator_voltage"), sweep.trace(i, "collector_current"), label=name)
+        ax.plot(dips["voltage"], dips["current"], "ro")
+        for dip in dips:
+            ax.annotate(f'{dip["voltage"]:.2f}V', (dip["voltage"], dip["current"]),
+                        textcoords="offset points", xytext=(0, 10), ha="center")
+        ax.set_xlabel("Accelerator Voltage (V)")
+        ax.set_ylabel("Collector Current (A)")
+        ax.set_title(f"Frank-Hertz Experiment: Accelerator Voltage vs Collector Current\n{name}")
+        ax.legend()
+        ax.grid(True)
+        fig.savefig(os.path.join(directory, f"{name}.png"), dpi=100)
+        plt.close(fig)
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def run(args):
+    settings = settings_from_args(args)
+    patterns = tuple(args.pattern) if args.pattern else ("*.csv", "*.xlsx")
+    paths = find_captures(args.directory, patterns)
+    if not paths:
+        print(f"No captures found in {args.directory}", file=sys.stderr)
+        return 1
+
+    index = ResultsIndex(args.index) if args.index else None
+    todo = index.stale(paths, settings) if index is not None else paths
+    if index is not None and args.figures:
+        # Figures need the traces, so draw every capture when asked for them
+        todo = paths
+
+    start = time.perf_counter()
+    dip_frames, fit_rows = [], []
+    for chunk in _chunks(todo, max(args.chunk_size, 1)):
+        sweep = ingest_sweep(chunk, workers=args.workers, cache_dir=args.cache_dir)
+        table, fits = analyse_sweep(sweep, settings, workers=args.workers)
+
+        bounds = np.searchsorted(table["trace"], np.arange(len(sweep) + 1))
+        for i, source in enumerate(sweep.sources):
+            if index is not None:
+                index.store(source, sweep.metadata[i], table[bounds[i]:bounds[i + 1]], fits[i], settings)
+            fit_rows.append({"source": source, "temperature": parse_temperature(source, sweep.metadata[i]),
+                             **{name: fits[i][name].item() for name in fits.dtype.names if name != "trace"}})
+        dip_frames.append(dips_to_frame(table, sweep.sources).drop(columns="trace"))
+
+        if args.figures:
+            save_figures(sweep, table, args.figures)
+    elapsed = time.perf_counter() - start
+
+    if index is not None:
+        # Report everything in the index for these paths, including rows that were not re-analysed
+        sources = {os.path.abspath(path) for path in paths}
+        dips = index.dips()
+        dips = dips[dips["source"].isin(sources)]
+        fits = index.fits()
+        fits = fits[fits["source"].isin(sources)].drop(columns="capture_id")
+        index.close()
+    else:
+        dips = pd.concat(dip_frames, ignore_index=True) if dip_frames else pd.DataFrame()
+        fits = pd.DataFrame(fit_rows)
+
+    report(dips, fits, args)
+    print(f"{len(todo)} of {len(paths)} captures analysed in {elapsed:.2f} s", file=sys.stderr)
+    return 0
+
+
+def report(dips, fits, args):
+    """Write the dip and fit tables in the requested format."""
+    if args.output:
+        os.makedirs(args.output, exist_ok=True)
+    if args.format == "table":
+        with pd.option_context("display.max_rows", None, "display.width", 200):
+            if args.output:
+                for name, frame in (("dips", dips), ("fits", fits)):
+                    with open(os.path.join(args.output, f"{name}.txt"), "w", encoding="utf-8") as f:
+                        f.write(frame.to_string(index=False) + "\n")
+            else:
+                print(fits.to_string(index=False))
+    elif args.format == "csv":
+        if args.output:
+            dips.to_csv(os.path.join(args.output, "dips.csv"), index=False)
+            fits.to_csv(os.path.join(args.output, "fits.csv"), index=False)
+        else:
+            fits.to_csv(sys.stdout, index=False)
+    elif args.format == "json":
+        # NaN is not valid JSON, write null instead
+        payload = {name: frame.astype(object).where(frame.notna(), None).to_dict(orient="records")
+                   for name, frame in (("fits", fits), ("dips", dips))}
+        text = json.dumps(payload, indent=1, default=json_default)
+        if args.output:
+            with open(os.path.join(args.output, "results.json"), "w", encoding="utf-8") as f:
+                f.write(text)
+        else:
+            print(text)
+
+
+def main(argv=None):
+    return run(build_parser().parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
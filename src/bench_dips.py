@@ -0,0 +1,66 @@
+"""
+Benchmark: dip detection throughput in traces per second.
+
+Compares the notebook's one-trace-at-a-time identify_current_dips loop with
+dips.detect_dips on a synthetic Franck-Hertz sweep. Run from the src folder:
+    python bench_dips.py [--traces N] [--samples N] [--workers N]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import scipy.signal
+
+from dips import detect_dips
+
+
+def identify_current_dips(voltage, current, distance=10, prominence=0.1, width=5, exclude_ends=800):
+    """The detector from the notebook, kept as the baseline."""
+    voltage = voltage[exclude_ends:-exclude_ends]
+    current = current[exclude_ends:-exclude_ends]
+    dips, _ = scipy.signal.find_peaks(current, distance=distance, prominence=prominence, width=width)
+    dips += exclude_ends
+    return dips
+
+
+def synthetic_sweep(n_traces, n_samples, seed=0):
+    """Noisy Franck-Hertz-like I(V) traces: a rising current with a dip every ~4.9 V."""
+    rng = np.random.default_rng(seed)
+    voltage = np.tile(np.linspace(0, 40, n_samples), (n_traces, 1))
+    offset = rng.uniform(-0.3, 0.3, (n_traces, 1))
+    current = 0.1 * voltage * (1.2 + np.cos(2 * np.pi * (voltage - offset) / 4.9))
+    current += rng.normal(0, 0.02, current.shape)
+    return voltage, current
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--traces", type=int, default=500)
+    parser.add_argument("--samples", type=int, default=2500)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    voltage, current = synthetic_sweep(args.traces, args.samples)
+
+    start = time.perf_counter()
+    for i in range(args.traces):
+        identify_current_dips(voltage[i], current[i])
+    baseline = time.perf_counter() - start
+
+    start = time.perf_counter()
+    table = detect_dips(voltage, current)
+    inline = time.perf_counter() - start
+
+    start = time.perf_counter()
+    detect_dips(voltage, current, workers=args.workers)
+    parallel = time.perf_counter() - start
+
+    print(f"{args.traces} traces x {args.samples} samples, {len(table)} dips")
+    print(f"notebook loop          : {args.traces / baseline:10.0f} traces/s")
+    print(f"detect_dips            : {args.traces / inline:10.0f} traces/s")
+    print(f"detect_dips {args.workers:>2} workers : {args.traces / parallel:10.0f} traces/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark: notebook loader cell (read_csv + applymap(convert_to_volts)) against scope_loader.
+
+Run from the src folder:
+    python bench_loader.py [files ...] [--repeat N]
+"""
+
+import argparse
+import glob
+import time
+
+import numpy as np
+import pandas as pd
+
+from scope_loader import load_capture, parse_si
+
+
+def convert_to_volts(value):
+    """The per-cell converter from the notebook, kept as the baseline."""
+    try:
+        if isinstance(value, str):
+            if value.endswith('m'):
+                return float(value[:-1]) / 1000
+            elif value.endswith('u'):
+                return float(value[:-1]) / 1_000_000
+        return float(value)
+    except ValueError:
+        return np.nan
+
+
+def load_notebook_cell(file_path):
+    """What the notebook loader cell does for one file."""
+    df = pd.read_csv(file_path, usecols=[3, 4, 10])
+    # DataFrame.applymap was renamed to DataFrame.map in pandas 2.1
+    elementwise = getattr(df, "map", None) or df.applymap
+    df = elementwise(convert_to_volts)
+    return df.iloc[:, 0].values, df.iloc[:, 1].values, df.iloc[:, 2].values
+
+
+def load_fast(file_path):
+    capture = load_capture(file_path)
+    return capture.time, capture.accelerator_voltage, capture.collector_current
+
+
+def best_time(func, files, repeat):
+    """Best wall time over `repeat` runs of loading every file once."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for file_path in files:
+            func(file_path)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def best_column_time(func, column, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(column)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def suffixed_column(n, seed=0):
+    """A column like the Excel reports write: a mix of '12.3m', '450u' and plain numbers."""
+    rng = np.random.default_rng(seed)
+    values = rng.uniform(-10, 10, n)
+    suffix = rng.choice(["m", "u", ""], n)
+    return np.array([f"{v:.2f}{s}" for v, s in zip(values, suffix)], dtype=object)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("files", nargs="*", help="captures to load (default: check*.csv)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    files = args.files or sorted(glob.glob("check*.csv"))
+    if not files:
+        parser.error("no capture files found")
+
+    baseline = best_time(load_notebook_cell, files, args.repeat)
+    fast = best_time(load_fast, files, args.repeat)
+
+    print(f"{len(files)} files, best of {args.repeat}")
+    print(f"notebook cell : {baseline * 1e3:8.2f} ms  ({baseline / len(files) * 1e3:.2f} ms/file)")
+    print(f"scope_loader  : {fast * 1e3:8.2f} ms  ({fast / len(files) * 1e3:.2f} ms/file)")
+    print(f"speedup       : {baseline / fast:8.1f}x")
+
+    # Suffix parsing on its own, per 2500-point column, which is where applymap hurts
+    column = suffixed_column(2500)
+    baseline = best_column_time(lambda c: np.array([convert_to_volts(v) for v in c]), column, args.repeat)
+    fast = best_column_time(parse_si, column, args.repeat)
+    print()
+    print("SI-suffixed column, 2500 points")
+    print(f"convert_to_volts per cell : {baseline * 1e3:8.2f} ms")
+    print(f"parse_si whole column     : {fast * 1e3:8.2f} ms")
+    print(f"speedup                   : {baseline / fast:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
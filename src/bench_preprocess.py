@@ -0,0 +1,98 @@
+"""
+Benchmark: memory and time of the notebook's preprocessing loop vs preprocess.preprocess_batch.
+
+numpy reports its buffers to tracemalloc, so the peak traced memory above
+the input arrays shows how much temporary memory each version needs. It is
+also given relative to the size of the inputs. The allocation count is the
+number of memory blocks the call leaves behind (new arrays and copies), from
+tracemalloc snapshot statistics. Run from the src folder:
+    python bench_preprocess.py [--traces N] [--samples N]
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from preprocess import preprocess_batch
+
+
+def notebook_loop(time_data, accelerator_voltage_data, collector_current_data):
+    """The notebook's preprocessing cell (without smoothing), kept as the baseline."""
+    for i in range(len(time_data)):
+        time_data[i] = np.where(np.isnan(time_data[i]), np.nanmean(time_data[i]), time_data[i])
+        accelerator_voltage_data[i] = np.where(np.isnan(accelerator_voltage_data[i]), np.nanmean(accelerator_voltage_data[i]), accelerator_voltage_data[i])
+        collector_current_data[i] = np.where(np.isnan(collector_current_data[i]), np.nanmean(collector_current_data[i]), collector_current_data[i])
+
+        time_data[i] = time_data[i] - np.min(time_data[i])
+        accelerator_voltage_data[i] = accelerator_voltage_data[i] - np.min(accelerator_voltage_data[i])
+        collector_current_data[i] = collector_current_data[i] - np.min(collector_current_data[i])
+
+    time_data = time_data.astype(float)
+    accelerator_voltage_data = accelerator_voltage_data.astype(float)
+    collector_current_data = collector_current_data.astype(float)
+    return time_data, accelerator_voltage_data, collector_current_data
+
+
+def batched(time_data, accelerator_voltage_data, collector_current_data, dtype=np.float64):
+    return tuple(preprocess_batch(data, dtype=dtype)
+                 for data in (time_data, accelerator_voltage_data, collector_current_data))
+
+
+def synthetic_channels(n_traces, n_samples, dtype=np.float64, seed=0):
+    rng = np.random.default_rng(seed)
+    channels = []
+    for _ in range(3):
+        data = rng.normal(size=(n_traces, n_samples)).astype(dtype)
+        data[rng.random(data.shape) < 0.01] = np.nan
+        channels.append(data)
+    return channels
+
+
+def _snapshot():
+    return tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+
+
+def measure(func, channels):
+    """Wall time, peak traced memory above the inputs and (blocks, bytes) left allocated by func(*channels)."""
+    tracemalloc.start()
+    before_snapshot = _snapshot()
+    tracemalloc.reset_peak()
+    before, _ = tracemalloc.get_traced_memory()
+    start = time.perf_counter()
+    result = func(*channels)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    # Blocks still held after the call, per allocating line, against the state before it
+    stats = _snapshot().compare_to(before_snapshot, "lineno")
+    blocks = sum(stat.count_diff for stat in stats if stat.count_diff > 0)
+    block_bytes = sum(stat.size_diff for stat in stats if stat.size_diff > 0)
+    tracemalloc.stop()
+    del result
+    return seconds, peak - before, blocks, block_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--traces", type=int, default=200)
+    parser.add_argument("--samples", type=int, default=2500)
+    args = parser.parse_args()
+
+    cases = [
+        ("notebook loop (float64)", notebook_loop, np.float64),
+        ("preprocess_batch (float64)", batched, np.float64),
+        ("preprocess_batch (float32)", lambda *c: batched(*c, dtype=np.float32), np.float32),
+    ]
+    print(f"3 channels x {args.traces} traces x {args.samples} samples")
+    for name, func, dtype in cases:
+        channels = synthetic_channels(args.traces, args.samples, dtype)
+        input_bytes = sum(data.nbytes for data in channels)
+        seconds, extra, blocks, block_bytes = measure(func, channels)
+        print(f"{name:28s} {seconds * 1e3:8.2f} ms   inputs {input_bytes / 2**20:7.2f} MiB   "
+              f"peak extra {extra / 2**20:7.2f} MiB   ({extra / input_bytes:5.2f}x inputs)   "
+              f"{blocks:4d} blocks left ({block_bytes / 2**20:7.2f} MiB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,472 @@
+"""
+Benchmark suite: analysis pipeline and presentation scenes.
+
+Every case runs on fixed, seeded synthetic data: single traces from 2,500
+up to 10^7 samples and sweeps of 1 to 1,000 traces for the analysis, and
+electron counts, lattice densities and Text counts for the scenes. Each
+case runs in a fresh process (so its peak RSS is its own), once as warm-up
+and then --repeats times (default 20). The report gives min and p50
+latency, p95 once there are at least MIN_P95_REPEATS repeats, throughput
+(items per second at the p50 latency) and peak RSS, and can be saved as
+JSON and compared against a stored baseline, flagging cases that got
+slower or bigger. Scene cases need manim and are skipped without it.
+Run from the src folder:
+
+    python bench_suite.py [--scale quick|full] [--only detect] [--output results.json]
+    python bench_suite.py --compare baseline.json [--threshold 0.1]
+    python bench_suite.py --results new.json --compare baseline.json   # compare two saved runs
+"""
+
+import argparse
+import contextlib
+import fnmatch
+import importlib.util
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+SCENE_DIR = Path(__file__).resolve().parents[1] / "Reports" / "Presentation" / "my-project"
+
+# Below this many repeats the 95th percentile is just the slowest run, so it is not reported
+MIN_P95_REPEATS = 20
+
+SCALES = {
+    "quick": {
+        "samples": [2_500, 250_000, 2_500_000],
+        "csv_samples": [2_500, 250_000],
+        "traces": [1, 10, 100, 1_000],
+        "particles": [10_000, 100_000],
+        "electrons": [10, 100, 1_000],
+        "holes": [6, 20, 60],
+        "texts": [1, 10, 50],
+    },
+    "full": {
+        "samples": [2_500, 25_000, 250_000, 2_500_000, 10_000_000],
+        "csv_samples": [2_500, 25_000, 250_000, 2_500_000],
+        "traces": [1, 10, 100, 1_000],
+        "particles": [10_000, 100_000, 1_000_000],
+        "electrons": [10, 100, 1_000, 10_000],
+        "holes": [6, 20, 60, 200],
+        "texts": [1, 10, 50, 200],
+    },
+}
+
+
+@dataclass
+class Case:
+    """
+    One benchmark: setup(**params) prepares the data and returns the timed call, which returns its item count.
+
+    A setup that leaves something to clean up (a temporary file) is a context
+    manager yielding the timed call instead.
+    """
+    name: str
+    group: str
+    unit: str
+    grid: str               # SCALES key the parameter values come from
+    param: str
+    setup: callable
+    requires: tuple = ()
+
+
+CASES = {}
+
+
+def case(name, group, unit, grid, param=None, requires=()):
+    """Register a setup function as a benchmark case."""
+    def register(setup):
+        CASES[name] = Case(name, group, unit, grid, param or grid, setup, tuple(requires))
+        return setup
+    return register
+
+
+def synthetic_trace(n_samples, seed=0):
+    """One noisy Franck-Hertz-like I(V) trace over 0..40 V (as in bench_dips.synthetic_sweep)."""
+    from bench_dips import synthetic_sweep
+    voltage, current = synthetic_sweep(1, n_samples, seed)
+    return voltage[0], current[0]
+
+
+def _exclude_ends(n_samples):
+    return min(800, n_samples // 10)
+
+
+# ---------------------------------------------------------------- analysis
+
+@case("parse_csv", "analysis", "samples", "csv_samples", "samples")
+@contextlib.contextmanager
+def _parse_csv(samples):
+    from scope_loader import Capture, read_scope_csv, write_scope_csv
+    voltage, current = synthetic_trace(samples)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.csv")
+        write_scope_csv(path, Capture(path, np.arange(samples) * 4e-4, voltage, current, {"sample_interval": 4e-4}))
+        yield lambda: len(read_scope_csv(path))
+
+
+@case("parse_si", "analysis", "samples", "csv_samples", "samples")
+def _parse_si(samples):
+    from scope_loader import parse_si
+    values = np.char.add(np.round(synthetic_trace(samples)[1] * 1e3, 2).astype(str), "m")
+    return lambda: parse_si(values).size
+
+
+def _smooth_case(method, **kwargs):
+    def setup(samples):
+        from smoothing import smooth
+        current = synthetic_trace(samples)[1]
+        return lambda: smooth(current, method, **kwargs).size
+    return setup
+
+
+case("smooth_boxcar", "analysis", "samples", "samples", "samples")(_smooth_case("boxcar", window_size=5))
+case("smooth_savgol", "analysis", "samples", "samples", "samples")(_smooth_case("savgol", window_size=11))
+case("smooth_lowpass", "analysis", "samples", "samples", "samples")(_smooth_case("lowpass", cutoff=0.05))
+
+
+@case("detect_dips_trace", "analysis", "samples", "samples", "samples")
+def _detect_dips_trace(samples):
+    from dips import detect_dips
+    voltage, current = synthetic_trace(samples)
+    # Dips are ~4.9 V apart, keep find_peaks' distance at a fraction of that in samples
+    distance = max(samples // 40, 10)
+
+    def run():
+        detect_dips(voltage, current, exclude_ends=_exclude_ends(samples), distance=distance)
+        return samples
+    return run
+
+
+@case("detect_dips_sweep", "analysis", "traces", "traces", "traces")
+def _detect_dips_sweep(traces):
+    from bench_dips import synthetic_sweep
+    from dips import detect_dips
+    voltage, current = synthetic_sweep(traces, 2_500)
+
+    def run():
+        detect_dips(voltage, current)
+        return traces
+    return run
+
+
+@case("preprocess_sweep", "analysis", "traces", "traces", "traces")
+def _preprocess(traces):
+    from bench_dips import synthetic_sweep
+    from preprocess import preprocess_batch
+    _, current = synthetic_sweep(traces, 2_500)
+    current[:, ::97] = np.nan
+    return lambda: preprocess_batch(current.copy()).shape[0]
+
+
+@case("pipeline_sweep", "analysis", "traces", "traces", "traces")
+def _pipeline(traces):
+    from bench_dips import synthetic_sweep
+    from ingest import Sweep
+    from pipeline import analyse_sweep
+    voltage, current = synthetic_sweep(traces, 2_500)
+    offsets = np.arange(traces + 1) * 2_500
+
+    def run():
+        # analyse_sweep works in place, so every run gets fresh copies
+        sweep = Sweep([f"trace{i}" for i in range(traces)], offsets, np.tile(np.arange(2_500) * 4e-4, traces),
+                      voltage.ravel().copy(), current.ravel().copy(), [{}] * traces)
+        analyse_sweep(sweep)
+        return traces
+    return run
+
+
+@case("decimate", "analysis", "samples", "samples", "samples")
+def _decimate(samples):
+    from decimate import minmax_decimate
+    voltage, current = synthetic_trace(samples)
+
+    def run():
+        minmax_decimate(voltage, current, 1920)
+        return samples
+    return run
+
+
+@case("simulate", "analysis", "particles", "particles", "particles")
+def _simulate(particles):
+    from simulation import simulate
+    voltages = np.linspace(0, 40, 10)
+    return lambda: simulate(voltages, n_particles=particles, seed=0).voltages.size * particles
+
+
+# ---------------------------------------------------------------- scenes
+
+def _scene_imports():
+    if str(SCENE_DIR) not in sys.path:
+        sys.path.insert(0, str(SCENE_DIR))
+
+
+def _raster(mobjects):
+    """Rasterize one frame of the mobjects with a fresh Cairo camera."""
+    from manim import Camera
+    camera = Camera()
+
+    def frame():
+        camera.reset()
+        camera.capture_mobjects(mobjects)
+    return frame
+
+
+def _electron_positions(count, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.column_stack([rng.uniform(-3.2, -2.5, count), rng.uniform(-0.5, 0.6, count), np.zeros(count)])
+
+
+@case("electron_build", "scene", "electrons", "electrons", "electrons", requires=("manim",))
+def _electron_build(electrons):
+    _scene_imports()
+    from manim import ORIGIN, RIGHT, ValueTracker
+    from electrons import ElectronStream
+    positions = _electron_positions(electrons)
+    phases = np.random.default_rng(1).uniform(0, 5, electrons)
+    return lambda: ElectronStream(positions, phases, ORIGIN, RIGHT * 3, ValueTracker(5)).num_electrons
+
+
+@case("electron_frame", "scene", "frames", "electrons", "electrons", requires=("manim",))
+def _electron_frame(electrons):
+    _scene_imports()
+    from manim import ORIGIN, RIGHT, ValueTracker
+    from electrons import ElectronStream
+    stream = ElectronStream(_electron_positions(electrons), np.random.default_rng(1).uniform(0, 5, electrons),
+                            ORIGIN, RIGHT * 3, ValueTracker(5))
+    raster = _raster([stream])
+
+    def run():
+        stream.update(1 / 30)
+        raster()
+        return 1
+    return run
+
+
+@case("lattice_build", "scene", "holes", "holes", "holes", requires=("manim",))
+def _lattice_build(holes):
+    _scene_imports()
+    from lattice import Lattice
+
+    def run():
+        Lattice(holes=(holes, holes), hole_radius=0.2 / holes)
+        return holes * holes
+    return run
+
+
+@case("lattice_frame", "scene", "frames", "holes", "holes", requires=("manim",))
+def _lattice_frame(holes):
+    _scene_imports()
+    from lattice import Lattice
+    lattice = Lattice(holes=(holes, holes), hole_radius=0.2 / holes, wires=holes)
+    raster = _raster([lattice])
+    return lambda: raster() or 1
+
+
+@case("text_build", "scene", "texts", "texts", "texts", requires=("manim",))
+def _text_build(texts):
+    _scene_imports()
+    from manim import Text
+    labels = [f"{4.9 * (i + 1):.1f} eV" for i in range(texts)]
+    return lambda: len([Text(label, font_size=24) for label in labels])
+
+
+@case("text_frame", "scene", "frames", "texts", "texts", requires=("manim",))
+def _text_frame(texts):
+    _scene_imports()
+    from manim import DOWN, Text, VGroup
+    group = VGroup(*(Text(f"{4.9 * (i + 1):.1f} eV", font_size=24) for i in range(texts))).arrange(DOWN)
+    raster = _raster([group])
+    return lambda: raster() or 1
+
+
+# ---------------------------------------------------------------- running
+
+def _peak_rss_mb():
+    """Peak resident set size of this process in MiB."""
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10
+
+
+def measure(name, params, repeats=20, warmup=1):
+    """Set up and time one case in this process; returns a result dict."""
+    case_ = CASES[name]
+    rss_before = _peak_rss_mb()
+    with contextlib.ExitStack() as stack:
+        run = case_.setup(**params)
+        if isinstance(run, contextlib.AbstractContextManager):
+            run = stack.enter_context(run)
+        for _ in range(warmup):
+            run()
+        latencies, items = [], 0
+        for _ in range(repeats):
+            start = time.perf_counter()
+            items = run()
+            latencies.append(time.perf_counter() - start)
+    latencies = np.array(latencies)
+    p50 = float(np.percentile(latencies, 50))
+    p95 = float(np.percentile(latencies, 95)) if repeats >= MIN_P95_REPEATS else None
+    peak = _peak_rss_mb()
+    return {
+        "name": name, "group": case_.group, "params": params, "unit": case_.unit, "items": int(items),
+        "repeats": repeats, "min": float(latencies.min()), "p50": p50, "p95": p95,
+        "mean": float(latencies.mean()), "throughput": items / p50 if p50 > 0 else float("inf"),
+        "peak_rss_mb": peak, "rss_delta_mb": peak - rss_before,
+    }
+
+
+def _available(requirement):
+    return importlib.util.find_spec(requirement) is not None
+
+
+def run_suite(scale="quick", only=None, repeats=20, isolate=True):
+    """Run every matching case over its parameter grid; yields result dicts (or skip records)."""
+    grid = SCALES[scale]
+    context = multiprocessing.get_context("spawn")
+    for case_ in CASES.values():
+        if only and not any(fnmatch.fnmatch(case_.name, f"*{pattern}*") for pattern in only):
+            continue
+        missing = [req for req in case_.requires if not _available(req)]
+        for value in grid[case_.grid]:
+            params = {case_.param: value}
+            if missing:
+                yield {"name": case_.name, "group": case_.group, "params": params,
+                       "skipped": f"needs {', '.join(missing)}"}
+                continue
+            if not isolate:
+                yield measure(case_.name, params, repeats)
+                continue
+            # A fresh process per case keeps peak RSS and caches from leaking between cases
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                yield pool.submit(measure, case_.name, params, repeats).result()
+
+
+def _key(result):
+    return result["name"], json.dumps(result["params"], sort_keys=True)
+
+
+def compare(results, baseline, threshold=0.1, rss_threshold=0.2):
+    """
+    Match results to baseline cases and flag regressions.
+
+    A case regresses when its p50 latency grew by more than `threshold` or
+    its peak RSS by more than `rss_threshold` (fractions).
+    """
+    previous = {_key(row): row for row in baseline if "p50" in row}
+    rows = []
+    for row in results:
+        if "p50" not in row or _key(row) not in previous:
+            continue
+        base = previous[_key(row)]
+        time_ratio = row["p50"] / base["p50"] if base["p50"] > 0 else float("inf")
+        rss_ratio = row["peak_rss_mb"] / base["peak_rss_mb"] if base["peak_rss_mb"] > 0 else 1.0
+        status = "ok"
+        if time_ratio > 1 + threshold:
+            status = "SLOWER"
+        elif rss_ratio > 1 + rss_threshold:
+            status = "BIGGER"
+        elif time_ratio < 1 - threshold:
+            status = "faster"
+        rows.append({**row, "time_ratio": time_ratio, "rss_ratio": rss_ratio, "status": status})
+    return rows
+
+
+def _format_params(params):
+    return ", ".join(f"{k}={v:,}" for k, v in params.items())
+
+
+def print_results(results, file=sys.stdout):
+    print(f"{'case':20s} {'params':22s} {'min ms':>10} {'p50 ms':>10} {'p95 ms':>10} {'throughput':>18} "
+          f"{'peak RSS':>10}", file=file)
+    for row in results:
+        if "skipped" in row:
+            print(f"{row['name']:20s} {_format_params(row['params']):22s} skipped ({row['skipped']})", file=file)
+            continue
+        rate = f"{row['throughput']:,.0f} {row['unit']}/s"
+        p95 = f"{row['p95'] * 1e3:10.2f}" if row.get("p95") is not None else f"{'-':>10}"
+        print(f"{row['name']:20s} {_format_params(row['params']):22s} {row.get('min', row['p50']) * 1e3:10.2f} "
+              f"{row['p50'] * 1e3:10.2f} {p95} {rate:>18} {row['peak_rss_mb']:7.0f} MiB", file=file)
+
+
+def print_comparison(rows, file=sys.stdout):
+    print(f"{'case':20s} {'params':22s} {'p50 ms':>10} {'time':>7} {'RSS':>7}  status", file=file)
+    for row in rows:
+        print(f"{row['name']:20s} {_format_params(row['params']):22s} {row['p50'] * 1e3:10.2f} "
+              f"{row['time_ratio']:6.2f}x {row['rss_ratio']:6.2f}x  {row['status']}", file=file)
+
+
+def metadata(scale):
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "commit": commit, "scale": scale,
+        "python": platform.python_version(), "numpy": np.__version__, "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", choices=SCALES, default="quick", help="dataset sizes (full goes up to 10^7 samples)")
+    parser.add_argument("--only", nargs="+", help="run only cases whose name contains one of these")
+    parser.add_argument("--repeats", type=int, default=20,
+                        help=f"timed runs per case; p95 needs at least {MIN_P95_REPEATS}")
+    parser.add_argument("--in-process", action="store_true", help="run cases in this process (faster, shared RSS)")
+    parser.add_argument("--output", help="write the results as JSON")
+    parser.add_argument("--results", help="show (and --compare) this saved JSON instead of running the suite")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="allowed p50 slowdown (fraction)")
+    parser.add_argument("--rss-threshold", type=float, default=0.2, help="allowed peak RSS growth (fraction)")
+    parser.add_argument("--list", action="store_true", help="list the cases and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for case_ in CASES.values():
+            print(f"{case_.group:9s} {case_.name:20s} {case_.param}: {SCALES[args.scale][case_.grid]}")
+        return 0
+
+    if args.results:
+        with open(args.results, encoding="utf-8") as f:
+            report = json.load(f)
+        meta = report.get("meta", {})
+        print(f"{args.results}: {meta.get('scale')} scale at {meta.get('commit')}, {meta.get('timestamp')}")
+    else:
+        results = []
+        for result in run_suite(args.scale, args.only, args.repeats, isolate=not args.in_process):
+            print_results([result], file=sys.stderr)
+            results.append(result)
+        report = {"meta": metadata(args.scale), "results": results}
+    print_results(report["results"])
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=1)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = compare(report["results"], baseline["results"], args.threshold, args.rss_threshold)
+        print(f"\ncompared with {args.compare} ({baseline['meta'].get('commit')})")
+        print_comparison(rows)
+        regressions = [row for row in rows if row["status"] in ("SLOWER", "BIGGER")]
+        if regressions:
+            print(f"{len(regressions)} regression(s)")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
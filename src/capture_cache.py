@@ -0,0 +1,166 @@
+"""
+On-disk cache of parsed captures.
+
+Each capture is stored as one .npy file holding a (3, n) float64 array
+(time, accelerator voltage, collector current) plus a small .json file with
+the header metadata and the size/mtime of the source it came from. Entries
+are opened with np.load(mmap_mode="r"), so a second pass over an unchanged
+dataset does no text or Excel parsing at all.
+
+Entries are keyed by the absolute source path and are considered stale as
+soon as the source size or mtime changes. When the cache grows past its
+size budget the least recently used entries are removed.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+
+from scope_loader import Capture, load_capture
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".capture_cache")
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3  # 2 GiB
+
+
+def json_default(value):
+    """json.dump fallback for numpy scalars and anything else the sheets contain."""
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+class CaptureCache:
+    """Memory-mapped .npy cache of parsed captures, invalidated by source size and mtime."""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _entry_paths(self, path):
+        key = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return base + ".npy", base + ".json"
+
+    @staticmethod
+    def _source_stamp(path):
+        stat = os.stat(path)
+        return {"source": os.path.abspath(path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def get(self, path):
+        """Return the cached Capture for `path`, or None if missing or stale."""
+        data_path, meta_path = self._entry_paths(path)
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                entry = json.load(f)
+            if entry["stamp"] != self._source_stamp(path):
+                return None
+            data = np.load(data_path, mmap_mode="r")
+        except (OSError, ValueError, KeyError):
+            return None
+
+        # Touch the entry so eviction sees it as recently used
+        os.utime(meta_path)
+        return Capture(os.fspath(path), data[0], data[1], data[2], entry["metadata"])
+
+    def put(self, path, capture):
+        """Store a parsed capture and evict old entries if over budget."""
+        data_path, meta_path = self._entry_paths(path)
+        data = np.stack([capture.time, capture.accelerator_voltage, capture.collector_current]).astype(np.float64)
+        entry = {"stamp": self._source_stamp(path), "metadata": capture.metadata}
+
+        # Write to unique temporary files first, so a crash never leaves a half-written
+        # entry and concurrent writers of the same entry (pool workers, the CLI and the
+        # notebook sharing a cache) never touch each other's files
+        fd, tmp_data = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, data)
+        fd, tmp_meta = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entry, f, default=json_default)
+        try:
+            os.replace(tmp_data, data_path)
+            os.replace(tmp_meta, meta_path)
+        except OSError:
+            # Lost a race with another writer (e.g. the entry is open elsewhere on
+            # Windows); its entry holds the same data, so just drop ours
+            pass
+        finally:
+            for tmp in (tmp_data, tmp_meta):
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+
+        self.evict()
+
+    def load(self, path, loader=load_capture):
+        """Return the capture for `path`, parsing and caching it on a miss."""
+        capture = self.get(path)
+        if capture is not None:
+            self.hits += 1
+            return capture
+
+        self.misses += 1
+        capture = loader(path)
+        self.put(path, capture)
+        return self.get(path) or capture
+
+    def _entries(self):
+        """List (last_used, size, paths) for every complete entry in the cache."""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            meta_path = os.path.join(self.cache_dir, name)
+            data_path = meta_path[:-len(".json")] + ".npy"
+            try:
+                size = os.path.getsize(meta_path) + os.path.getsize(data_path)
+                last_used = os.path.getmtime(meta_path)
+            except OSError:
+                continue
+            entries.append((last_used, size, (data_path, meta_path)))
+        return entries
+
+    def size(self):
+        """Total bytes used by the cache."""
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits in max_bytes."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, paths in entries:
+            if total <= self.max_bytes:
+                break
+            for entry_path in paths:
+                try:
+                    os.remove(entry_path)
+                except OSError:
+                    pass
+            total -= size
+
+    def clear(self):
+        """Remove every entry from the cache."""
+        for _, _, paths in self._entries():
+            for entry_path in paths:
+                try:
+                    os.remove(entry_path)
+                except OSError:
+                    pass
+
+
+_default_cache = None
+
+
+def load_cached(path, cache=None):
+    """load_capture through a CaptureCache (the default one in src/.capture_cache if not given)."""
+    global _default_cache
+    if cache is None:
+        if _default_cache is None:
+            _default_cache = CaptureCache()
+        cache = _default_cache
+    return cache.load(path)
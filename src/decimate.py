@@ -0,0 +1,69 @@
+"""
+Min/max decimation of traces to screen resolution.
+
+A plotted trace never needs more than two points per pixel column: the
+lowest and the highest sample falling into it. Keeping both, in the order
+they occur in the capture, draws the same envelope as the full trace
+(including narrow spikes and the dips) from 2 * n_columns points, however
+many samples the capture holds.
+"""
+
+import numpy as np
+
+
+def column_index(x, n_columns, x_range=None):
+    """Pixel column (0 .. n_columns - 1) of every x value; values outside x_range get -1."""
+    x = np.asarray(x, dtype=np.float64)
+    lo, hi = x_range if x_range is not None else (np.nanmin(x), np.nanmax(x))
+    span = hi - lo if hi > lo else 1.0
+    column = np.floor((x - lo) / span * n_columns).astype(np.int64)
+    column[column == n_columns] = n_columns - 1  # x == hi belongs to the last column
+    column[(column < 0) | (column >= n_columns) | np.isnan(x)] = -1
+    return column
+
+
+def minmax_decimate(x, y, n_columns, x_range=None):
+    """
+    Reduce (x, y) to at most two points per pixel column.
+
+    Samples are binned by x into n_columns equal-width columns. Every
+    non-empty column contributes its minimum and maximum y sample (one
+    point if they coincide), in capture order, so the returned path keeps
+    the trace's shape. Columns come out left to right. NaN samples are
+    dropped.
+
+    Returns (x, y, index): the kept samples and their positions in the input.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    column = column_index(x, n_columns, x_range)
+    keep = np.flatnonzero((column >= 0) & ~np.isnan(y))
+    if len(keep) == 0:
+        empty = np.empty(0)
+        return empty, empty, np.empty(0, dtype=np.int64)
+
+    # Group samples by column; a ramping voltage is already (nearly) in order
+    columns = column[keep]
+    if np.all(columns[1:] >= columns[:-1]):
+        order = keep
+    else:
+        order = keep[np.argsort(columns, kind="stable")]
+        columns = column[order]
+    values = y[order]
+    starts = np.flatnonzero(np.r_[True, columns[1:] != columns[:-1]])
+    group = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(order)]))
+
+    # First sample reaching each column's minimum and maximum
+    lows, highs = np.full(len(starts), len(order)), np.full(len(starts), len(order))
+    for extreme, reduce in ((lows, np.minimum), (highs, np.maximum)):
+        at = np.flatnonzero(values == reduce.reduceat(values, starts)[group])
+        np.minimum.at(extreme, group[at], at)
+    lows, highs = order[lows], order[highs]
+
+    # Per column, emit the earlier of the two samples first and drop duplicates
+    pairs = np.column_stack([np.minimum(lows, highs), np.maximum(lows, highs)])
+    index = pairs.ravel()
+    single = np.repeat(lows == highs, 2)
+    single[0::2] = False
+    index = index[~single]
+    return x[index], y[index], index
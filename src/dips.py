@@ -0,0 +1,137 @@
+"""
+Dip/peak detection over a whole sweep at once.
+
+detect_dips takes the stacked (n_traces, n_samples) accelerator voltage and
+collector current arrays (or a ragged Sweep) and returns every dip of every
+trace in one structured array, without touching matplotlib:
+
+    trace    index of the trace in the batch
+    dip      ordinal of the dip within its trace (0, 1, 2, ...)
+    index    sample index of the dip
+    voltage  accelerator voltage at the dip
+    current  collector current at the dip
+    delta_v  voltage spacing to the previous dip of the same trace (NaN for the first)
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import scipy.signal
+
+DIP_DTYPE = np.dtype([
+    ("trace", np.int32),
+    ("dip", np.int32),
+    ("index", np.int64),
+    ("voltage", np.float64),
+    ("current", np.float64),
+    ("delta_v", np.float64),
+])
+
+# Same defaults as identify_current_dips in the notebook
+DEFAULT_PARAMS = {"distance": 10, "prominence": 0.1, "width": 5}
+DEFAULT_EXCLUDE_ENDS = 800
+
+
+def _as_traces(data):
+    """Turn a 2-D array or a list of 1-D arrays into a list of 1-D traces."""
+    if isinstance(data, np.ndarray) and data.ndim == 1:
+        return [data]
+    return list(data)
+
+
+def _find_dips(currents, exclude_ends, invert, params):
+    """Peak indices of every trace in `currents`, ignoring `exclude_ends` samples at each end."""
+    found = []
+    for current in currents:
+        stop = len(current) - exclude_ends
+        if stop <= exclude_ends:
+            found.append(np.empty(0, dtype=np.int64))
+            continue
+        window = current[exclude_ends:stop]
+        if invert:
+            window = -window
+        peaks, _ = scipy.signal.find_peaks(window, **params)
+        found.append(peaks.astype(np.int64) + exclude_ends)
+    return found
+
+
+def _chunks(items, n_chunks):
+    bounds = np.linspace(0, len(items), n_chunks + 1).astype(int)
+    return [items[a:b] for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+
+def detect_dips(voltage, current, exclude_ends=DEFAULT_EXCLUDE_ENDS, invert=False, preprocess=None,
+                workers=1, **params):
+    """
+    Find the dips of every trace and return them as one DIP_DTYPE table.
+
+    voltage, current: (n_traces, n_samples) arrays, or lists of 1-D arrays for
+        ragged sweeps.
+    exclude_ends: samples ignored at both ends of every trace.
+    invert: look for minima of the current instead of maxima. The notebook
+        searches for maxima of CH2, which is the default here.
+    preprocess: optional function applied to the whole current batch before
+        detection, e.g. smoothing along axis 1. It must keep sample indices
+        aligned with the voltage axis.
+    workers: number of processes to split the traces over (1 runs inline).
+    params: passed on to scipy.signal.find_peaks (distance, prominence, width, ...).
+    """
+    params = {**DEFAULT_PARAMS, **params}
+    if preprocess is not None:
+        current = preprocess(current)
+    voltages = _as_traces(voltage)
+    currents = _as_traces(current)
+    if len(voltages) != len(currents):
+        raise ValueError(f"{len(voltages)} voltage traces but {len(currents)} current traces")
+
+    workers = workers or os.cpu_count()
+    if workers > 1 and len(currents) > 1:
+        chunks = _chunks(currents, min(workers, len(currents)))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(_find_dips, chunks, [exclude_ends] * len(chunks),
+                               [invert] * len(chunks), [params] * len(chunks))
+            dips_per_trace = [dips for chunk in results for dips in chunk]
+    else:
+        dips_per_trace = _find_dips(currents, exclude_ends, invert, params)
+
+    # Build the table in one go from the concatenated per-trace indices
+    counts = np.array([len(dips) for dips in dips_per_trace], dtype=np.int64)
+    table = np.empty(counts.sum(), dtype=DIP_DTYPE)
+    if len(table) == 0:
+        return table
+
+    starts = np.cumsum(counts) - counts
+    table["trace"] = np.repeat(np.arange(len(counts)), counts)
+    table["dip"] = np.arange(len(table)) - np.repeat(starts, counts)
+    table["index"] = np.concatenate(dips_per_trace)
+    table["voltage"] = np.concatenate([v[dips] for v, dips in zip(voltages, dips_per_trace)])
+    table["current"] = np.concatenate([c[dips] for c, dips in zip(currents, dips_per_trace)])
+
+    delta_v = np.empty(len(table))
+    delta_v[0] = np.nan
+    delta_v[1:] = np.diff(table["voltage"])
+    delta_v[table["dip"] == 0] = np.nan
+    table["delta_v"] = delta_v
+    return table
+
+
+def detect_sweep_dips(sweep, **kwargs):
+    """detect_dips over a (possibly ragged) Sweep from ingest.ingest_sweep."""
+    voltages = [sweep.trace(i, "accelerator_voltage") for i in range(len(sweep))]
+    currents = [sweep.trace(i, "collector_current") for i in range(len(sweep))]
+    return detect_dips(voltages, currents, **kwargs)
+
+
+def dips_of_trace(table, trace):
+    """Rows of the dip table belonging to one trace."""
+    return table[table["trace"] == trace]
+
+
+def dips_to_frame(table, sources=None):
+    """Dip table as a pandas DataFrame, with the source file of every row if `sources` is given."""
+    frame = pd.DataFrame(table)
+    if sources is not None:
+        frame.insert(1, "source", np.asarray(sources, dtype=object)[table["trace"]])
+    return frame
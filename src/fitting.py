@@ -0,0 +1,171 @@
+"""
+Sub-sample dip positions and the Franck-Hertz spacing fit.
+
+refine_dips moves every dip of a dip table (see dips.py) from its integer
+sample index to a fractional one with a 3-point parabolic or Gaussian fit,
+and re-reads voltage, current and delta_v there.
+
+fit_spacing fits the spacing model from the EnergyEquation scene,
+
+    dE(n) = E_n - E_(n-1) = [1 + (lambda / L) (2n - 1)] E_a,
+
+to the delta_v of every trace. The model is linear in n,
+dE(n) = a + b n with a = E_a (1 - lambda/L) and b = 2 E_a lambda/L, so every
+trace is fitted at once by least squares from per-trace sums.
+
+Both steps work on whole sweeps without looping over traces in Python.
+"""
+
+import numpy as np
+
+from dips import DIP_DTYPE
+
+REFINED_DTYPE = np.dtype(DIP_DTYPE.descr + [("position", np.float64)])
+
+FIT_DTYPE = np.dtype([
+    ("trace", np.int32),
+    ("n_spacings", np.int32),
+    ("e_a", np.float64),
+    ("e_a_err", np.float64),
+    ("lambda_over_l", np.float64),
+    ("lambda_over_l_err", np.float64),
+    ("lambda", np.float64),
+    ("lambda_err", np.float64),
+])
+
+
+def _gather(data, trace, index, offsets):
+    """data[trace, index] for a 2-D batch, or the same on a flat ragged array with offsets."""
+    if offsets is None:
+        return data[trace, index]
+    return data[offsets[trace] + index]
+
+
+def refine_dips(voltage, current, table, method="parabolic", invert=False, offsets=None):
+    """
+    Refine dip positions to sub-sample precision.
+
+    voltage, current: the batch the dips were found on, as (n_traces, n_samples)
+        arrays, or flat ragged arrays with `offsets` (e.g. a Sweep's channels).
+    method: "parabolic" fits a parabola through the dip and its two
+        neighbours; "gaussian" does the same on the logarithm, which is exact
+        for Gaussian-shaped peaks. Where the Gaussian fit is not defined
+        (non-positive samples) the parabolic result is used.
+    invert: set it as in detect_dips, so minima are refined instead of maxima.
+
+    Returns a REFINED_DTYPE table: the input columns, with voltage, current and
+    delta_v re-read at the fractional `position`.
+    """
+    if method not in ("parabolic", "gaussian"):
+        raise ValueError(f"Unknown refinement method {method!r}")
+
+    refined = np.empty(len(table), dtype=REFINED_DTYPE)
+    for name in DIP_DTYPE.names:
+        refined[name] = table[name]
+    if len(table) == 0:
+        return refined
+
+    trace = table["trace"].astype(np.int64)
+    index = table["index"]
+    lengths = (np.full(trace.max() + 1, current.shape[-1]) if offsets is None
+               else np.diff(offsets))[trace]
+    inner = (index > 0) & (index < lengths - 1)
+
+    # Clamp so edge dips can be gathered; they keep a zero offset below
+    left_index = np.where(inner, index - 1, index)
+    right_index = np.where(inner, index + 1, index)
+    y_left = _gather(current, trace, left_index, offsets)
+    y_mid = _gather(current, trace, index, offsets)
+    y_right = _gather(current, trace, right_index, offsets)
+    sign = -1.0 if invert else 1.0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        curvature = y_left - 2 * y_mid + y_right
+        shift = 0.5 * (y_left - y_right) / curvature
+        if method == "gaussian":
+            l, m, r = (np.log(sign * y) for y in (y_left, y_mid, y_right))
+            gaussian_shift = 0.5 * (l - r) / (l - 2 * m + r)
+            shift = np.where(np.isfinite(gaussian_shift), gaussian_shift, shift)
+    shift = np.where(inner & np.isfinite(shift), np.clip(shift, -0.5, 0.5), 0.0)
+
+    # Parabola value at the vertex, and voltage interpolated at the fractional index
+    refined["position"] = index + shift
+    refined["current"] = np.where(shift != 0, y_mid - 0.25 * (y_left - y_right) * shift, y_mid)
+    neighbour = np.where(shift >= 0, right_index, left_index)
+    v_mid = _gather(voltage, trace, index, offsets)
+    v_neighbour = _gather(voltage, trace, neighbour, offsets)
+    refined["voltage"] = v_mid + np.abs(shift) * (v_neighbour - v_mid)
+
+    delta_v = np.diff(refined["voltage"], prepend=np.nan)
+    delta_v[table["dip"] == 0] = np.nan
+    refined["delta_v"] = delta_v
+    return refined
+
+
+def fit_spacing(table, n_traces=None, first_dip_order=1, tube_length=None):
+    """
+    Fit dE(n) = [1 + (lambda/L)(2n - 1)] E_a to the dip spacings of every trace.
+
+    table: dip table from detect_dips or refine_dips.
+    n_traces: number of traces in the batch (default: highest trace + 1);
+        traces without enough dips get NaN results.
+    first_dip_order: order n of the first detected dip of each trace. The
+        spacing between dips n - 1 and n is dE(n), so the first spacing has
+        n = first_dip_order + 1.
+    tube_length: cathode-grid distance L; when given, lambda = (lambda/L) * L
+        is filled in with the same units.
+
+    Returns one FIT_DTYPE row per trace with 1-sigma uncertainties from the
+    least-squares residuals (NaN with fewer than three spacings).
+    """
+    if n_traces is None:
+        n_traces = int(table["trace"].max()) + 1 if len(table) else 0
+
+    spacing = table[np.isfinite(table["delta_v"])]
+    trace = spacing["trace"].astype(np.int64)
+    n = spacing["dip"] + first_dip_order  # dip k (0-based) ends spacing n = first_dip_order + k
+    y = spacing["delta_v"]
+
+    # Per-trace least-squares sums
+    count = np.bincount(trace, minlength=n_traces).astype(np.float64)
+    sx = np.bincount(trace, n, minlength=n_traces)
+    sy = np.bincount(trace, y, minlength=n_traces)
+    sxx = np.bincount(trace, n * n, minlength=n_traces)
+    sxy = np.bincount(trace, n * y, minlength=n_traces)
+
+    fits = np.zeros(n_traces, dtype=FIT_DTYPE)
+    fits["trace"] = np.arange(n_traces)
+    fits["n_spacings"] = count
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        det = count * sxx - sx * sx
+        b = (count * sxy - sx * sy) / det
+        a = (sy - b * sx) / count
+
+        residual = y - (a[trace] + b[trace] * n)
+        sigma2 = np.bincount(trace, residual * residual, minlength=n_traces) / (count - 2)
+        sigma2[count < 3] = np.nan
+        var_a = sigma2 * sxx / det
+        var_b = sigma2 * count / det
+        cov_ab = -sigma2 * sx / det
+
+        e_a = a + b / 2
+        ratio = b / (2 * a + b)
+        # Error propagation for E_a = a + b/2 and lambda/L = b / (2a + b)
+        e_a_var = var_a + var_b / 4 + cov_ab
+        da = -2 * b / (2 * a + b) ** 2
+        db = 2 * a / (2 * a + b) ** 2
+        ratio_var = da * da * var_a + db * db * var_b + 2 * da * db * cov_ab
+
+    fitted = count >= 2
+    fits["e_a"] = np.where(fitted, e_a, np.nan)
+    fits["lambda_over_l"] = np.where(fitted, ratio, np.nan)
+    fits["e_a_err"] = np.sqrt(e_a_var)
+    fits["lambda_over_l_err"] = np.sqrt(ratio_var)
+    if tube_length is None:
+        fits["lambda"] = np.nan
+        fits["lambda_err"] = np.nan
+    else:
+        fits["lambda"] = fits["lambda_over_l"] * tube_length
+        fits["lambda_err"] = fits["lambda_over_l_err"] * tube_length
+    return fits
@@ -0,0 +1,136 @@
+"""
+Batch ingestion of a whole temperature sweep.
+
+Files are parsed in a process pool, each worker writing its capture into the
+CaptureCache. The parent then copies every capture once from the
+memory-mapped cache entries into one preallocated contiguous array per
+channel. Captures of different lengths are kept ragged: trace i of a channel
+is data[offsets[i]:offsets[i + 1]]. When every capture has the same length the
+channels can also be viewed as (n_traces, n_samples) arrays without copying.
+"""
+
+import glob
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from capture_cache import DEFAULT_CACHE_DIR, CaptureCache
+
+CAPTURE_PATTERNS = ("*.csv", "*.xlsx")
+CHANNELS = ("time", "accelerator_voltage", "collector_current")
+
+
+@dataclass
+class FileTiming:
+    """How long one file took to ingest, and whether it came from the cache."""
+    source: str
+    seconds: float
+    cached: bool
+    samples: int
+
+
+@dataclass
+class Sweep:
+    """All captures of a sweep, stored as one contiguous ragged array per channel."""
+    sources: list
+    offsets: np.ndarray
+    time: np.ndarray
+    accelerator_voltage: np.ndarray
+    collector_current: np.ndarray
+    metadata: list = field(default_factory=list)
+    timings: list = field(default_factory=list)
+
+    def __len__(self):
+        return len(self.sources)
+
+    @property
+    def lengths(self):
+        return np.diff(self.offsets)
+
+    def trace(self, i, channel="collector_current"):
+        """Samples of capture i for one channel (a view, no copy)."""
+        return getattr(self, channel)[self.offsets[i]:self.offsets[i + 1]]
+
+    def stacked(self, channel="collector_current"):
+        """(n_traces, n_samples) view of a channel; only valid when all captures have the same length."""
+        lengths = self.lengths
+        if len(lengths) and np.any(lengths != lengths[0]):
+            raise ValueError("captures have different lengths; use trace(i) or offsets instead")
+        n_samples = int(lengths[0]) if len(lengths) else 0
+        return getattr(self, channel).reshape(len(self), n_samples)
+
+
+def _natural_key(path):
+    """Sort check2 < check10 and 110 < 155 the way a person would."""
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", os.path.basename(path))]
+
+
+def find_captures(directory, patterns=CAPTURE_PATTERNS):
+    """List capture files in a sweep directory, in natural order."""
+    paths = set()
+    for pattern in patterns:
+        paths.update(glob.glob(os.path.join(directory, pattern)))
+    return sorted(paths, key=_natural_key)
+
+
+def _ingest_one(path, cache_dir):
+    """Worker: make sure `path` is in the cache and report its length and timing."""
+    start = time.perf_counter()
+    # Eviction is left to the parent so a worker never removes an entry another one just wrote
+    cache = CaptureCache(cache_dir, max_bytes=float("inf"))
+    capture = cache.load(path)
+    seconds = time.perf_counter() - start
+    return len(capture), capture.metadata, FileTiming(os.fspath(path), seconds, cache.hits > 0, len(capture))
+
+
+def ingest_sweep(paths, workers=None, cache_dir=DEFAULT_CACHE_DIR, dtype=np.float64):
+    """
+    Load every capture of a sweep into one Sweep.
+
+    `paths` is a sweep directory or a list of capture files. `workers` is the
+    process count (None uses all cores, 1 parses in this process).
+    """
+    if isinstance(paths, (str, os.PathLike)) and os.path.isdir(paths):
+        paths = find_captures(paths)
+    paths = [os.fspath(path) for path in paths]
+
+    # Parse (or validate cached) files in parallel; only lengths and metadata come back
+    if workers == 1 or len(paths) <= 1:
+        results = [_ingest_one(path, cache_dir) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_ingest_one, paths, [cache_dir] * len(paths)))
+
+    lengths = np.array([length for length, _, _ in results], dtype=np.int64)
+    offsets = np.zeros(len(paths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+
+    # One preallocated buffer per channel, filled straight from the memory-mapped entries
+    channels = {name: np.empty(offsets[-1], dtype=dtype) for name in CHANNELS}
+    cache = CaptureCache(cache_dir)
+    timings = []
+    for i, path in enumerate(paths):
+        start = time.perf_counter()
+        capture = cache.load(path)
+        for name in CHANNELS:
+            channels[name][offsets[i]:offsets[i + 1]] = getattr(capture, name)
+        timing = results[i][2]
+        timing.seconds += time.perf_counter() - start
+        timings.append(timing)
+    cache.evict()
+
+    return Sweep(paths, offsets, metadata=[metadata for _, metadata, _ in results], timings=timings, **channels)
+
+
+def print_timings(sweep):
+    """Print the per-file ingestion timings of a sweep."""
+    for timing in sweep.timings:
+        origin = "cache" if timing.cached else "parsed"
+        print(f"{os.path.basename(timing.source):>20}  {timing.samples:>9} samples  "
+              f"{timing.seconds * 1e3:8.2f} ms  ({origin})")
+    total = sum(timing.seconds for timing in sweep.timings)
+    print(f"{len(sweep)} files, {sweep.offsets[-1]} samples, {total * 1e3:.2f} ms of file time")
@@ -0,0 +1,92 @@
+"""
+The full analysis chain over a set of captures:
+
+    ingest -> preprocess -> smooth -> detect dips -> refine -> fit spacings
+
+analyse_paths returns one (source, metadata, dips, fit) tuple per capture,
+which is what ResultsIndex.update expects.
+"""
+
+import numpy as np
+
+from dips import detect_sweep_dips
+from fitting import fit_spacing, refine_dips
+from ingest import ingest_sweep
+from preprocess import preprocess_sweep
+from smoothing import smooth
+
+DEFAULT_SETTINGS = {
+    "smoothing": "boxcar",      # None, or a smoothing.FILTERS name
+    "smooth_window": 5,         # boxcar / savgol window in samples
+    "cutoff": 0.05,             # lowpass cutoff in cycles per sample
+    "exclude_ends": 800,
+    "invert": False,
+    "distance": 10,
+    "prominence": 0.1,
+    "width": 5,
+    "refine": "parabolic",      # None, "parabolic" or "gaussian"
+    "first_dip_order": 1,
+    "tube_length": None,
+}
+
+
+def resolve_settings(settings=None):
+    """DEFAULT_SETTINGS updated with `settings`, rejecting unknown keys."""
+    settings = dict(settings or {})
+    unknown = set(settings) - set(DEFAULT_SETTINGS)
+    if unknown:
+        raise ValueError(f"Unknown analysis settings: {sorted(unknown)}")
+    return {**DEFAULT_SETTINGS, **settings}
+
+
+def _smooth_sweep(sweep, settings):
+    """Smooth voltage and current of every trace in place with the configured filter."""
+    method = settings["smoothing"]
+    if not method:
+        return
+    kwargs = {"cutoff": settings["cutoff"]} if method == "lowpass" else {"window_size": settings["smooth_window"]}
+    for name in ("accelerator_voltage", "collector_current"):
+        lengths = sweep.lengths
+        if len(lengths) and np.all(lengths == lengths[0]):
+            batch = sweep.stacked(name)
+            batch[...] = smooth(batch, method, axis=1, **kwargs)
+        else:
+            for i in range(len(sweep)):
+                trace = sweep.trace(i, name)
+                trace[...] = smooth(trace, method, **kwargs)
+
+
+def analyse_sweep(sweep, settings=None, workers=1):
+    """Run preprocessing, detection and fitting on an ingested Sweep (modified in place)."""
+    settings = resolve_settings(settings)
+    preprocess_sweep(sweep)
+    _smooth_sweep(sweep, settings)
+
+    table = detect_sweep_dips(
+        sweep,
+        exclude_ends=settings["exclude_ends"],
+        invert=settings["invert"],
+        workers=workers,
+        distance=settings["distance"],
+        prominence=settings["prominence"],
+        width=settings["width"],
+    )
+    if settings["refine"]:
+        table = refine_dips(sweep.accelerator_voltage, sweep.collector_current, table,
+                            method=settings["refine"], invert=settings["invert"], offsets=sweep.offsets)
+    fits = fit_spacing(table, n_traces=len(sweep), first_dip_order=settings["first_dip_order"],
+                       tube_length=settings["tube_length"])
+    return table, fits
+
+
+def analyse_paths(paths, settings=None, workers=None, **ingest_kwargs):
+    """Ingest and analyse `paths`; returns a list of (source, metadata, dips, fit) per capture."""
+    sweep = ingest_sweep(paths, workers=workers, **ingest_kwargs)
+    table, fits = analyse_sweep(sweep, settings, workers=1)
+
+    # Split the dip table by trace (it is already sorted by trace)
+    bounds = np.searchsorted(table["trace"], np.arange(len(sweep) + 1))
+    return [
+        (source, metadata, table[bounds[i]:bounds[i + 1]], fits[i])
+        for i, (source, metadata) in enumerate(zip(sweep.sources, sweep.metadata))
+    ]
@@ -0,0 +1,210 @@
+"""
+Persistent SQLite index of analysis results.
+
+Every analysed capture gets one row in `captures` (source path, size, mtime,
+temperature parsed from names like 155.xlsx, header metadata and the
+analysis settings), its dips in `dips` and its spacing fit in `fits`.
+Temperature-dependence queries and plots then read precomputed rows instead
+of re-running detection.
+
+update() only re-analyses captures that are new, whose file changed (size
+or mtime), or that were analysed with different settings.
+"""
+
+import json
+import os
+import re
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from capture_cache import json_default
+from pipeline import resolve_settings
+
+DEFAULT_INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results.sqlite")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS captures (
+    id INTEGER PRIMARY KEY,
+    source TEXT UNIQUE NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    temperature REAL,
+    record_length INTEGER,
+    sample_interval REAL,
+    metadata TEXT,
+    settings TEXT
+);
+CREATE TABLE IF NOT EXISTS dips (
+    capture_id INTEGER NOT NULL REFERENCES captures(id) ON DELETE CASCADE,
+    dip INTEGER NOT NULL,
+    sample_index INTEGER NOT NULL,
+    position REAL,
+    voltage REAL,
+    current REAL,
+    delta_v REAL,
+    PRIMARY KEY (capture_id, dip)
+);
+CREATE TABLE IF NOT EXISTS fits (
+    capture_id INTEGER PRIMARY KEY REFERENCES captures(id) ON DELETE CASCADE,
+    n_spacings INTEGER,
+    e_a REAL,
+    e_a_err REAL,
+    lambda_over_l REAL,
+    lambda_over_l_err REAL,
+    lambda REAL,
+    lambda_err REAL
+);
+CREATE INDEX IF NOT EXISTS captures_temperature ON captures(temperature);
+"""
+
+
+def parse_temperature(path, metadata=None):
+    """Temperature in °C from the file name (155.xlsx, 155C.csv) or the sheet's Temp setting."""
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)\s*C?", os.path.splitext(os.path.basename(path))[0], re.IGNORECASE)
+    if match:
+        return float(match.group(1))
+    settings = (metadata or {}).get("settings", {})
+    match = re.match(r"\s*(\d+(?:\.\d+)?)", str(settings.get("Temp", "")))
+    return float(match.group(1)) if match else None
+
+
+class ResultsIndex:
+    """SQLite store of per-capture dips and fits."""
+
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @staticmethod
+    def _stamp(source):
+        stat = os.stat(source)
+        return stat.st_size, stat.st_mtime_ns
+
+    @staticmethod
+    def _settings_json(settings):
+        # Resolved against the defaults, so {} and the explicit default settings share one key
+        return json.dumps(resolve_settings(settings), sort_keys=True, default=json_default)
+
+    def is_current(self, source, settings=None):
+        """True if `source` is indexed, unchanged on disk and analysed with `settings`."""
+        row = self.connection.execute(
+            "SELECT size, mtime_ns, settings FROM captures WHERE source = ?", (os.path.abspath(source),)
+        ).fetchone()
+        if row is None:
+            return False
+        return (row[0], row[1]) == self._stamp(source) and row[2] == self._settings_json(settings)
+
+    def stale(self, sources, settings=None):
+        """The subset of `sources` that needs (re-)analysis."""
+        return [source for source in sources if not self.is_current(source, settings)]
+
+    def store(self, source, metadata, dips, fit=None, settings=None):
+        """
+        Replace the results of one capture.
+
+        dips: rows of a DIP_DTYPE or REFINED_DTYPE table for this capture.
+        fit: its FIT_DTYPE row, if a fit was made.
+        """
+        source = os.path.abspath(source)
+        size, mtime_ns = self._stamp(source)
+        metadata = metadata or {}
+        with self.connection:
+            self.connection.execute("DELETE FROM captures WHERE source = ?", (source,))
+            cursor = self.connection.execute(
+                "INSERT INTO captures (source, size, mtime_ns, temperature, record_length, sample_interval,"
+                " metadata, settings) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (source, size, mtime_ns, parse_temperature(source, metadata), metadata.get("record_length"),
+                 metadata.get("sample_interval"), json.dumps(metadata, default=json_default),
+                 self._settings_json(settings)),
+            )
+            capture_id = cursor.lastrowid
+
+            names = dips.dtype.names if len(dips) else ()
+            position = dips["position"] if "position" in names else dips["index"].astype(np.float64)
+            self.connection.executemany(
+                "INSERT INTO dips VALUES (?, ?, ?, ?, ?, ?, ?)",
+                zip([capture_id] * len(dips), dips["dip"].tolist(), dips["index"].tolist(), position.tolist(),
+                    dips["voltage"].tolist(), dips["current"].tolist(),
+                    [None if np.isnan(d) else d for d in dips["delta_v"].tolist()]),
+            )
+            if fit is not None:
+                values = [None if np.isnan(fit[name]) else float(fit[name])
+                          for name in ("e_a", "e_a_err", "lambda_over_l", "lambda_over_l_err", "lambda", "lambda_err")]
+                self.connection.execute("INSERT INTO fits VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                        [capture_id, int(fit["n_spacings"])] + values)
+        return capture_id
+
+    def remove_missing(self):
+        """Drop captures whose source file no longer exists."""
+        sources = [row[0] for row in self.connection.execute("SELECT source FROM captures")]
+        missing = [(source,) for source in sources if not os.path.exists(source)]
+        with self.connection:
+            self.connection.executemany("DELETE FROM captures WHERE source = ?", missing)
+        return [source for source, in missing]
+
+    def update(self, sources, analyse, settings=None):
+        """
+        Bring the index up to date for `sources`.
+
+        analyse(paths, settings) is called once with only the stale paths and
+        must return an iterable of (source, metadata, dips, fit) tuples, so it
+        can batch and parallelise the work (pipeline.analyse_paths fits).
+        Returns the list of re-analysed sources.
+        """
+        stale = self.stale(sources, settings)
+        if stale:
+            for source, metadata, dips, fit in analyse(stale, settings):
+                self.store(source, metadata, dips, fit, settings)
+        return stale
+
+    def _query(self, sql, params=()):
+        return pd.read_sql_query(sql, self.connection, params=params)
+
+    def captures(self):
+        """All indexed captures, ordered by temperature."""
+        return self._query("SELECT id, source, temperature, record_length, sample_interval FROM captures"
+                           " ORDER BY temperature, source")
+
+    def dips(self, min_temperature=None, max_temperature=None):
+        """Dips joined with their capture's temperature, optionally within a temperature range."""
+        sql = ("SELECT c.source, c.temperature, d.dip, d.sample_index, d.position, d.voltage, d.current, d.delta_v"
+               " FROM dips d JOIN captures c ON c.id = d.capture_id WHERE 1 = 1")
+        params = []
+        if min_temperature is not None:
+            sql += " AND c.temperature >= ?"
+            params.append(min_temperature)
+        if max_temperature is not None:
+            sql += " AND c.temperature <= ?"
+            params.append(max_temperature)
+        return self._query(sql + " ORDER BY c.temperature, c.source, d.dip", params)
+
+    def fits(self):
+        """Spacing fits with their capture's temperature."""
+        return self._query("SELECT c.source, c.temperature, f.* FROM fits f JOIN captures c ON c.id = f.capture_id"
+                           " ORDER BY c.temperature, c.source")
+
+    def dip_positions_by_temperature(self):
+        """
+        Dip voltages as a (temperature x dip) table, NaN where a capture has fewer dips.
+
+        This is the ragged-safe replacement for np.array(dip_positions) in the notebook.
+        """
+        dips = self.dips()
+        return dips.pivot_table(index="temperature", columns="dip", values="voltage", aggfunc="mean")
+
+    def temperature_dependence(self):
+        """Mean E_a and lambda/L per temperature, for plotting."""
+        return self.fits().groupby("temperature")[["e_a", "e_a_err", "lambda_over_l", "lambda_over_l_err"]].mean()
@@ -0,0 +1,233 @@
+"""
+Loaders for the Frank-Hertz oscilloscope captures.
+
+Two export formats show up in this folder:
+- checkN.csv: raw Tektronix TBS CSV export. Each channel takes 6 columns
+  (header label, header value, header unit, time, value, blank) and the
+  scope header rows (Record Length, Sample Interval, ...) sit next to the
+  first samples.
+- 110.xlsx ... 175.xlsx: "Data Report" sheets with No./Time/CH1/CH2 columns
+  starting at row 12, where values can carry SI suffixes such as "-2.50m".
+
+Both are returned as a Capture holding float64 arrays, with CH1 as the
+accelerator voltage and CH2 as the collector current.
+"""
+
+import csv
+import os
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+# SI prefixes the scope and the report software append to numbers
+SI_PREFIXES = {
+    "n": 1e-9,
+    "u": 1e-6,
+    "µ": 1e-6,
+    "m": 1e-3,
+    "k": 1e3,
+    "M": 1e6,
+}
+
+# Column layout of the Tektronix CSV export
+CSV_TIME_COLUMN = 3
+CSV_CH1_COLUMN = 4
+CSV_CH2_COLUMN = 10
+CSV_HEADER_COLUMNS = {"CH1": (0, 1), "CH2": (6, 7)}
+CSV_HEADER_ROWS = 32  # header labels never go past the first couple dozen rows
+
+# Layout of the "Data Report" Excel sheets
+XLSX_DATA_COLUMNS = "C:E"  # Time (s), CH1 (V), CH2 (V)
+XLSX_SETTINGS_COLUMNS = "G:H"  # Temp, AC V, Bias, heater, amp
+XLSX_SKIP_ROWS = 11
+
+
+@dataclass
+class Capture:
+    """One scope capture: time axis, accelerator voltage (CH1) and collector current (CH2)."""
+    source: str
+    time: np.ndarray
+    accelerator_voltage: np.ndarray
+    collector_current: np.ndarray
+    metadata: dict = field(default_factory=dict)
+
+    def __len__(self):
+        return len(self.time)
+
+
+# Lookup table from the last byte of a number to its scale factor
+_SCALE_BY_BYTE = np.ones(256)
+for _prefix, _scale in SI_PREFIXES.items():
+    if len(_prefix.encode()) == 1:
+        _SCALE_BY_BYTE[ord(_prefix)] = _scale
+
+
+def parse_si(values):
+    """
+    Convert a whole column of numbers with optional SI suffixes to float64.
+
+    Works on the column at once instead of calling a Python function per
+    cell: "2.5m" -> 0.0025, "40u" -> 4e-05, plain numbers pass through and
+    anything unparseable becomes NaN. Raises ValueError for non-ASCII
+    characters other than the micro sign.
+    """
+    arr = np.asarray(values)
+    if arr.dtype.kind in "fiub":
+        return arr.astype(np.float64)
+    if arr.dtype.kind != "S":
+        try:
+            arr = arr.astype(np.bytes_)
+        except UnicodeEncodeError:
+            # The micro sign (or Greek mu) is the only non-ASCII prefix, fold it into "u" so cells fit in bytes
+            arr = np.char.replace(np.char.replace(arr.astype(str), "\u00b5", "u"), "\u03bc", "u")
+            try:
+                arr = arr.astype(np.bytes_)
+            except UnicodeEncodeError as exc:
+                raise ValueError(f"Non-ASCII character {exc.object[exc.start:exc.end]!r} in a numeric column") from None
+    if arr.size == 0:
+        return np.empty(arr.shape, dtype=np.float64)
+
+    # View the fixed-width byte strings as an (n, width) character matrix
+    n, width = arr.size, arr.dtype.itemsize
+    chars = arr.reshape(-1).view(np.uint8).reshape(n, width).copy()
+
+    # Last printable character of every cell decides its scale
+    filled = (chars != 0) & (chars != ord(" "))
+    last = width - 1 - np.argmax(filled[:, ::-1], axis=1)
+    rows = np.arange(n)
+    scale = _SCALE_BY_BYTE[chars[rows, last]]
+    prefixed = scale != 1.0
+    chars[rows[prefixed], last[prefixed]] = ord(" ")
+
+    text = chars.view(f"S{width}").reshape(arr.shape)
+    try:
+        out = text.astype(np.float64)
+    except ValueError:
+        # At least one cell is not a number: let pandas coerce those to NaN
+        out = pd.to_numeric(pd.Series(text.reshape(-1).astype(str)), errors="coerce")
+        out = out.to_numpy(dtype=np.float64).reshape(arr.shape)
+    return out * scale.reshape(arr.shape)
+
+
+def _header_value(text):
+    """Parse a header cell to float when it is numeric, otherwise keep the string."""
+    scale = SI_PREFIXES.get(text[-1:], 1.0)
+    mantissa = text[:-1] if text[-1:] in SI_PREFIXES else text
+    try:
+        return float(mantissa) * scale
+    except ValueError:
+        return text
+
+
+def read_scope_header(path):
+    """Read the scope header rows (Record Length, Sample Interval, ...) of a CSV export."""
+    channels = {name: {} for name in CSV_HEADER_COLUMNS}
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        for row_number, row in enumerate(reader):
+            if row_number >= CSV_HEADER_ROWS:
+                break
+            for name, (label_col, value_col) in CSV_HEADER_COLUMNS.items():
+                if len(row) > value_col and row[label_col].strip():
+                    channels[name][row[label_col].strip()] = _header_value(row[value_col].strip())
+
+    ch1 = channels["CH1"]
+    metadata = {
+        "format": "tektronix_csv",
+        "record_length": int(ch1["Record Length"]) if "Record Length" in ch1 else None,
+        "sample_interval": ch1.get("Sample Interval"),
+        "trigger_point": ch1.get("Trigger Point"),
+        "channels": channels,
+    }
+    return metadata
+
+
+def _read_columns(path, usecols, **kwargs):
+    """Read numeric columns straight to float64, falling back to SI parsing if needed."""
+    try:
+        df = pd.read_csv(path, header=None, usecols=usecols, dtype=np.float64, **kwargs)
+        return [df[col].to_numpy() for col in usecols]
+    except ValueError:
+        # Some exports write values like "40.0m": read as text and parse whole columns
+        df = pd.read_csv(path, header=None, usecols=usecols, dtype=str, **kwargs)
+        return [parse_si(df[col].to_numpy()) for col in usecols]
+
+
+def read_scope_csv(path):
+    """Load a Tektronix CSV export (checkN.csv) into a Capture."""
+    metadata = read_scope_header(path)
+    time, voltage, current = _read_columns(
+        path,
+        [CSV_TIME_COLUMN, CSV_CH1_COLUMN, CSV_CH2_COLUMN],
+        nrows=metadata["record_length"],
+    )
+    return Capture(os.fspath(path), time, voltage, current, metadata)
+
+
+def read_report_xlsx(path):
+    """Load a "Data Report" Excel sheet (110.xlsx ... 175.xlsx) into a Capture."""
+    data = pd.read_excel(path, sheet_name=0, usecols=XLSX_DATA_COLUMNS, skiprows=XLSX_SKIP_ROWS, header=None)
+    data = data.dropna(how="all")
+    time, voltage, current = (parse_si(data[col].to_numpy()) for col in data.columns)
+
+    settings = pd.read_excel(path, sheet_name=0, usecols=XLSX_SETTINGS_COLUMNS, skiprows=XLSX_SKIP_ROWS - 1,
+                             header=None, nrows=8).dropna()
+    metadata = {
+        "format": "data_report_xlsx",
+        "record_length": len(time),
+        # the sheet rounds time to 10 us, so take the interval over the whole record
+        "sample_interval": float((time[-1] - time[0]) / (len(time) - 1)) if len(time) > 1 else None,
+        "trigger_point": None,
+        "settings": {str(k).strip(): v for k, v in zip(settings.iloc[:, 0], settings.iloc[:, 1])},
+    }
+    return Capture(os.fspath(path), time, voltage, current, metadata)
+
+
+def load_capture(path):
+    """Load a capture, picking the reader from the file extension."""
+    ext = os.path.splitext(os.fspath(path))[1].lower()
+    if ext == ".csv":
+        return read_scope_csv(path)
+    if ext in (".xlsx", ".xls"):
+        return read_report_xlsx(path)
+    raise ValueError(f"Unsupported capture format: {path}")
+
+
+def _scope_header_rows(capture, channel):
+    """Label/value/unit header cells of one channel, row by row as the TBS writes them."""
+    n = len(capture)
+    interval = capture.metadata.get("sample_interval") or (
+        float(capture.time[1] - capture.time[0]) if n > 1 else 0.0)
+    return {
+        0: ("Record Length", f"{n}", "Points"),
+        1: ("Sample Interval", f"{interval:.8E}", "s"),
+        2: ("Trigger Point", f"{capture.metadata.get('trigger_point') or 0.0}", "Samples"),
+        6: ("Source", channel, ""),
+        7: ("Vertical Units", "Volts", ""),
+        12: ("Pt Fmt", "Y", ""),
+        16: ("Note", capture.metadata.get("note", capture.metadata.get("format", "")), ""),
+    }
+
+
+def write_scope_csv(path, capture):
+    """
+    Write a Capture in the Tektronix CSV layout of checkN.csv.
+
+    Used for synthetic sweeps (see simulation.py) so they go through the same
+    loaders and analysis as real captures.
+    """
+    headers = {name: _scope_header_rows(capture, name) for name in CSV_HEADER_COLUMNS}
+    columns = {CSV_CH1_COLUMN: capture.accelerator_voltage, CSV_CH2_COLUMN: capture.collector_current}
+    width = CSV_CH2_COLUMN + 2
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f, lineterminator="\r\n")
+        for i, t in enumerate(capture.time):
+            row = [""] * width
+            for name, (label_col, value_col) in CSV_HEADER_COLUMNS.items():
+                if i in headers[name]:
+                    row[label_col:value_col + 2] = headers[name][i]
+            for column, values in columns.items():
+                row[column - 1] = f"{t:.8E}"
+                row[column] = f"{values[i]:.9g}"
+            writer.writerow(row)
@@ -0,0 +1,261 @@
+"""
+Monte Carlo Franck-Hertz tube.
+
+Electrons leave the cathode with a thermal energy, are accelerated by a
+uniform field over the cathode-grid gap and collide with Hg atoms after
+exponentially distributed free paths. The mean free path follows from the
+oven temperature through the Hg vapour pressure. At a collision an electron
+above the excitation threshold E_a excites the atom (loses E_a) with a
+probability that ramps up above threshold; otherwise the collision is
+elastic and costs the tiny 2m/M fraction of its energy. Electrons that reach
+the grid with more than the retarding voltage count as collector current.
+
+The model is 1-D along the field: scattering angles are not followed,
+which is the usual simplification for reproducing the I(V) curve and the
+(1 + (lambda/L)(2n - 1)) E_a growth of the dip spacing.
+
+Every step is vectorized over all particles of all voltage points, so
+10^6 particles per voltage run in a few seconds. Results come out as an
+I(V) curve, a synthetic capture in the checkN.csv layout (see
+scope_loader.write_scope_csv), and optional per-particle trajectories the
+scenes in Reports/Presentation/my-project can replay.
+"""
+
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from scope_loader import Capture, write_scope_csv
+
+BOLTZMANN = 1.380649e-23       # J/K
+BOLTZMANN_EV = 8.617333e-5     # eV/K
+HG_EXCITATION_ENERGY = 4.9     # eV, 6^3P_1 level
+ELECTRON_HG_MASS_RATIO = 5.486e-4 / 200.59
+
+# Events in recorded trajectories
+EVENT_START, EVENT_ELASTIC, EVENT_INELASTIC, EVENT_GRID = 0, 1, 2, 3
+
+
+def hg_vapour_pressure(temperature_c):
+    """Hg vapour pressure in Pa, p = 8.7e9 * 10^(-3110 / T) with T in kelvin."""
+    return 8.7 * 10 ** (9 - 3110 / (np.asarray(temperature_c, dtype=float) + 273.15))
+
+
+def mean_free_path(temperature_c, cross_section=2.1e-19):
+    """Electron mean free path in mm at the given oven temperature, lambda = kT / (p sigma)."""
+    kelvin = np.asarray(temperature_c, dtype=float) + 273.15
+    return BOLTZMANN * kelvin / (hg_vapour_pressure(temperature_c) * cross_section) * 1e3
+
+
+@dataclass
+class TubeParameters:
+    """Geometry and physics of the simulated tube; lengths in mm, energies in eV."""
+    temperature_c: float = 170.0
+    gap: float = 8.0                       # cathode-grid distance L
+    retarding_voltage: float = 1.5
+    excitation_energy: float = HG_EXCITATION_ENERGY
+    excitation_ramp: float = 1.0           # eV above threshold until excitation is certain
+    max_excitation_probability: float = 1.0
+    cross_section: float = 2.1e-19        # m^2, total e-Hg cross-section
+    cathode_temperature_k: float = 1100.0
+    contact_potential: float = 0.0
+    scatter_at_grid: bool = True           # random forward direction after the last elastic collision
+
+    @property
+    def mean_free_path(self):
+        return float(mean_free_path(self.temperature_c, self.cross_section))
+
+
+@dataclass
+class Trajectories:
+    """
+    Recorded paths of a few particles per voltage point, padded with NaN.
+
+    Arrays are (n_recorded, n_events): time (arbitrary units, from the
+    uniform-acceleration kinematics), position (mm from the cathode), energy
+    (eV) and event (EVENT_* codes). `reached` marks particles that got
+    through the retarding field to the collector.
+    """
+    voltage: np.ndarray
+    time: np.ndarray
+    position: np.ndarray
+    energy: np.ndarray
+    event: np.ndarray
+    reached: np.ndarray
+    gap: float = 8.0
+
+
+@dataclass
+class SimulationResult:
+    voltages: np.ndarray
+    current: np.ndarray                    # fraction of electrons reaching the collector
+    excitations: np.ndarray                # mean inelastic collisions per electron
+    params: TubeParameters = field(default_factory=TubeParameters)
+    trajectories: Trajectories = None
+
+
+def _distance_to_excitation(energy, gain, params, lam, rng):
+    """
+    Distance each electron travels until its next inelastic collision.
+
+    Collisions happen at rate 1/lam per mm and excite with probability
+    P(E) = p_max * min(1, (E - E_a) / ramp), E growing linearly with distance.
+    The excitation points are then a thinned Poisson process whose
+    cumulative hazard is piecewise quadratic/linear, so the distance is
+    drawn directly instead of stepping through every elastic collision.
+    """
+    gain = np.maximum(gain, 1e-12)
+    to_threshold = np.maximum(params.excitation_energy - energy, 0) / gain
+    above = np.maximum(energy - params.excitation_energy, 0)   # excess energy at the threshold point
+    rate = params.max_excitation_probability / lam
+    ramp = params.excitation_ramp
+
+    to_full = np.maximum(ramp - above, 0) / gain                # distance until P reaches p_max
+    hazard_full = rate * (above * to_full + 0.5 * gain * to_full ** 2) / ramp
+    z = rng.exponential(1.0, len(energy))
+
+    c = z * ramp / rate
+    in_ramp = (-above + np.sqrt(above ** 2 + 2 * gain * c)) / gain
+    past_ramp = to_full + (z - hazard_full) / rate
+    return to_threshold + np.where(z <= hazard_full, in_ramp, past_ramp)
+
+
+def _simulate_batch(voltages, n_particles, params, rng, n_record):
+    """Run n_particles electrons for each voltage; all voltages together in one particle array."""
+    n_voltages = len(voltages)
+    total = n_voltages * n_particles
+    lam = params.mean_free_path
+    elastic_loss = 2 * ELECTRON_HG_MASS_RATIO
+    field_gain = (np.asarray(voltages, dtype=float) - params.contact_potential) / params.gap  # eV per mm
+
+    gain = np.repeat(np.maximum(field_gain, 0), n_particles)
+    position = np.zeros(total)
+    energy = rng.exponential(BOLTZMANN_EV * params.cathode_temperature_k, total)
+    inelastic = np.zeros(total, dtype=np.int32)
+
+    # Particles 0..n_record-1 of every voltage point are followed in detail
+    record_ids = np.flatnonzero((np.arange(total) % n_particles) < n_record)
+    events = [[(0.0, energy[i], EVENT_START)] for i in record_ids]
+
+    active = np.arange(total)
+    while len(active):
+        x, e, g = position[active], energy[active], gain[active]
+        step = _distance_to_excitation(e, g, params, lam, rng)
+
+        # Electrons whose next excitation would be beyond the grid reach it
+        at_grid = x + step >= params.gap
+        step = np.where(at_grid, params.gap - x, step)
+
+        # Elastic collisions on the way only cost 2m/M of the energy each
+        n_elastic = rng.poisson(step / lam)
+        e_new = (e + g * step) * (1 - elastic_loss) ** n_elastic
+        e_new = np.where(at_grid, e_new, e_new - params.excitation_energy)
+        x = x + step
+
+        for i in np.intersect1d(active, record_ids, assume_unique=True):
+            j = np.searchsorted(active, i)
+            path = events[np.searchsorted(record_ids, i)]
+            # Elastic collisions are uniform along the segment, energy rises linearly
+            for xe in np.sort(rng.uniform(position[i], x[j], n_elastic[j])):
+                path.append((xe, energy[i] + g[j] * (xe - position[i]), EVENT_ELASTIC))
+            path.append((x[j], e_new[j], EVENT_GRID if at_grid[j] else EVENT_INELASTIC))
+
+        position[active], energy[active] = x, e_new
+        inelastic[active] += ~at_grid
+        active = active[~at_grid]
+
+    # The last elastic collision before the grid scatters the electron into a
+    # random forward direction; only the energy along the axis beats the
+    # retarding field.
+    forward = rng.random(total) if params.scatter_at_grid else 1.0
+    reached = energy * forward ** 2 > params.retarding_voltage
+    current = reached.reshape(n_voltages, n_particles).mean(axis=1)
+    excitations = inelastic.reshape(n_voltages, n_particles).mean(axis=1)
+    return current, excitations, events, reached[record_ids], np.repeat(voltages, n_record)
+
+
+def _pack_trajectories(events, reached, voltages, params):
+    """Pad the recorded event lists into arrays and add the time axis."""
+    n_events = max((len(e) for e in events), default=0)
+    shape = (len(events), n_events)
+    position, energy = np.full(shape, np.nan), np.full(shape, np.nan)
+    event = np.full(shape, -1, dtype=np.int8)
+    for i, path in enumerate(events):
+        path = np.array(path)
+        position[i, :len(path)], energy[i, :len(path)] = path[:, 0], path[:, 1]
+        event[i, :len(path)] = path[:, 2]
+
+    # Uniform acceleration between events: time = distance / mean speed, speed ~ sqrt(E).
+    # After an excitation the flight starts from the reduced energy.
+    end_energy = energy[:, 1:] + np.where(event[:, 1:] == EVENT_INELASTIC, params.excitation_energy, 0)
+    mean_speed = 0.5 * (np.sqrt(np.maximum(energy[:, :-1], 0)) + np.sqrt(np.maximum(end_energy, 0)))
+    flight = np.diff(position, axis=1) / np.maximum(mean_speed, 1e-6)
+    time = np.concatenate([np.zeros((len(events), 1)), np.cumsum(flight, axis=1)], axis=1)
+    time[np.isnan(position)] = np.nan
+    return Trajectories(np.asarray(voltages), time, position, energy, event, np.asarray(reached), params.gap)
+
+
+def simulate(voltages, n_particles=100_000, params=None, seed=None, record=0, batch_particles=4_000_000):
+    """
+    Simulate the collector current at every accelerating voltage.
+
+    voltages: accelerating voltages in V.
+    n_particles: electrons per voltage point.
+    record: number of particles per voltage point whose trajectories are kept.
+    batch_particles: particles processed together; voltage points are
+        batched so that n_voltages * n_particles stays below this.
+    """
+    params = params or TubeParameters()
+    rng = np.random.default_rng(seed)
+    voltages = np.asarray(voltages, dtype=float)
+    per_batch = max(batch_particles // n_particles, 1)
+
+    current = np.empty(len(voltages))
+    excitations = np.empty(len(voltages))
+    events, reached, event_voltages = [], [], []
+    for start in range(0, len(voltages), per_batch):
+        chunk = slice(start, start + per_batch)
+        result = _simulate_batch(voltages[chunk], n_particles, params, rng, record)
+        current[chunk], excitations[chunk] = result[0], result[1]
+        events += result[2]
+        reached.append(result[3])
+        event_voltages.append(result[4])
+
+    trajectories = None
+    if record:
+        trajectories = _pack_trajectories(events, np.concatenate(reached), np.concatenate(event_voltages), params)
+    return SimulationResult(voltages, current, excitations, params, trajectories)
+
+
+def synthetic_capture(max_voltage=40.0, n_samples=2500, n_particles=5_000, params=None, seed=None,
+                      sample_interval=400e-6, current_scale=10.0, noise=0.0):
+    """
+    A simulated sweep as a Capture with the checkN.csv layout.
+
+    CH1 ramps linearly from 0 to max_voltage over the record and CH2 is the
+    collector current fraction times current_scale (volts across the
+    measuring amplifier), plus optional Gaussian noise.
+    """
+    params = params or TubeParameters()
+    rng = np.random.default_rng(seed)
+    voltage = np.linspace(0, max_voltage, n_samples)
+    result = simulate(voltage, n_particles=n_particles, params=params, seed=rng.integers(2 ** 32))
+    current = result.current * current_scale
+    if noise:
+        current = current + rng.normal(0, noise, n_samples)
+    time = np.arange(n_samples) * sample_interval
+    metadata = {
+        "format": "simulation",
+        "record_length": n_samples,
+        "sample_interval": sample_interval,
+        "trigger_point": 0.0,
+        "simulation": {name: getattr(params, name) for name in params.__dataclass_fields__},
+    }
+    return Capture("<simulation>", time, voltage, current, metadata)
+
+
+def write_synthetic_csv(path, **kwargs):
+    """Simulate a sweep with synthetic_capture and write it as a Tektronix-style CSV."""
+    capture = synthetic_capture(**kwargs)
+    write_scope_csv(path, capture)
+    return capture
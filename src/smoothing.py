@@ -0,0 +1,133 @@
+"""
+Smoothing filters for batches of traces.
+
+Every filter works along one axis of an n-d array (axis=-1 by default, i.e.
+along the samples of a (n_traces, n_samples) batch) and returns an array of
+the same shape. Output sample i is centred on input sample i, so dip indices
+found on smoothed data still index the voltage axis directly. The ends are
+handled the same way in every filter, by extending the data with one of the
+np.pad modes below.
+
+    boxcar    moving average through a cumulative sum, O(n) whatever the window
+    savgol    Savitzky-Golay polynomial smoothing (scipy.signal.savgol_filter)
+    lowpass   FFT low-pass with a cosine roll-off
+"""
+
+import numpy as np
+import scipy.signal
+
+EDGE_MODES = ("reflect", "symmetric", "edge", "wrap", "constant")
+
+
+def _check_mode(mode):
+    if mode not in EDGE_MODES:
+        raise ValueError(f"Unknown edge mode {mode!r}, expected one of {EDGE_MODES}")
+
+
+def _pad_axis(data, before, after, axis, mode):
+    pad_width = [(0, 0)] * data.ndim
+    pad_width[axis] = (before, after)
+    return np.pad(data, pad_width, mode=mode)
+
+
+def boxcar(data, window_size=5, axis=-1, mode="reflect"):
+    """
+    Centred moving average of `window_size` samples along `axis`.
+
+    Uses a running sum, so the cost does not grow with the window. For odd
+    windows the interior matches the notebook's
+    np.convolve(data, np.ones(w) / w, mode='valid'), shifted by w // 2 samples
+    to stay aligned.
+    """
+    _check_mode(mode)
+    data = np.asarray(data, dtype=np.float64)
+    axis = axis % data.ndim
+    if window_size < 1:
+        raise ValueError("window_size must be at least 1")
+    if window_size == 1:
+        return data.copy()
+
+    before = window_size // 2
+    after = window_size - 1 - before
+    padded = _pad_axis(data, before, after, axis, mode)
+
+    # csum[k] = sum of the first k padded samples; window i is csum[i + w] - csum[i]
+    shape = list(padded.shape)
+    shape[axis] += 1
+    csum = np.zeros(shape)
+    tail = [slice(None)] * data.ndim
+    tail[axis] = slice(1, None)
+    np.cumsum(padded, axis=axis, out=csum[tuple(tail)])
+    n = data.shape[axis]
+    upper = csum.take(np.arange(window_size, window_size + n), axis=axis)
+    lower = csum.take(np.arange(n), axis=axis)
+    return (upper - lower) / window_size
+
+
+def savgol(data, window_size=11, polyorder=3, axis=-1, mode="reflect"):
+    """Savitzky-Golay smoothing along `axis`; window_size must be odd."""
+    _check_mode(mode)
+    data = np.asarray(data, dtype=np.float64)
+    axis = axis % data.ndim
+    if window_size % 2 == 0:
+        raise ValueError("window_size must be odd")
+
+    # Pad ourselves so the ends are treated exactly like in boxcar and lowpass;
+    # the cropped result never reaches savgol_filter's own edge handling
+    half = window_size // 2
+    padded = _pad_axis(data, half, half, axis, mode)
+    filtered = scipy.signal.savgol_filter(padded, window_size, polyorder, axis=axis, mode="nearest")
+    return filtered.take(np.arange(half, half + data.shape[axis]), axis=axis)
+
+
+def lowpass(data, cutoff, axis=-1, mode="reflect", sample_interval=None, rolloff=0.2, pad=None):
+    """
+    FFT low-pass filter along `axis`.
+
+    cutoff is in cycles per sample (0 .. 0.5), or in Hz if sample_interval is
+    given in seconds. The gain rolls off with a raised cosine from
+    cutoff * (1 - rolloff) to cutoff to limit ringing. `pad` samples
+    (default: a tenth of the trace, at least 16) are added at both ends
+    with `mode` so the FFT's wrap-around does not smear one end into the other.
+    """
+    _check_mode(mode)
+    data = np.asarray(data, dtype=np.float64)
+    axis = axis % data.ndim
+    n = data.shape[axis]
+    if sample_interval is not None:
+        cutoff = cutoff * sample_interval
+    if not 0 < cutoff <= 0.5:
+        raise ValueError("cutoff must be between 0 and the Nyquist frequency")
+
+    if pad is None:
+        pad = max(n // 10, 16)
+    pad = min(pad, n - 1) if mode in ("reflect", "symmetric") else pad
+    padded = _pad_axis(data, pad, pad, axis, mode)
+    m = padded.shape[axis]
+
+    freqs = np.fft.rfftfreq(m)
+    start = cutoff * (1 - rolloff)
+    gain = np.clip((cutoff - freqs) / max(cutoff - start, 1e-12), 0, 1)
+    gain = 0.5 - 0.5 * np.cos(np.pi * gain)
+    gain_shape = [1] * data.ndim
+    gain_shape[axis] = len(gain)
+
+    spectrum = np.fft.rfft(padded, axis=axis) * gain.reshape(gain_shape)
+    filtered = np.fft.irfft(spectrum, n=m, axis=axis)
+    return filtered.take(np.arange(pad, pad + n), axis=axis)
+
+
+FILTERS = {
+    "boxcar": boxcar,
+    "savgol": savgol,
+    "lowpass": lowpass,
+}
+
+
+def smooth(data, method="boxcar", **kwargs):
+    """Apply one of the FILTERS by name, e.g. smooth(batch, "savgol", window_size=21)."""
+    try:
+        func = FILTERS[method]
+    except KeyError:
+        raise ValueError(f"Unknown smoothing method {method!r}, expected one of {tuple(FILTERS)}") from None
+    return func(data, **kwargs)
@@ -0,0 +1,183 @@
+"""
+Streaming analysis for acquisitions too long to hold in memory.
+
+A capture is read in chunks, smoothed with a moving average that carries
+its window tail across chunk boundaries, and fed to a dip detector that
+keeps only a bounded sample buffer. Dips are yielded as soon as they can no
+longer change, as DIP_DTYPE rows (see dips.py).
+
+Equivalence with the in-memory path:
+- MovingAverage gives exactly np.convolve(data, ones(w)/w, mode='valid') of
+  the whole record, the notebook's moving_average.
+- StreamingDipDetector gives exactly dips.detect_dips on the whole record as
+  long as every dip's prominence bases lie within `history` samples of it.
+  It runs find_peaks with wlen=2*history+1, so on longer records pass the
+  same wlen to detect_dips for a like-for-like comparison.
+"""
+
+import numpy as np
+import pandas as pd
+import scipy.signal
+
+from dips import DEFAULT_EXCLUDE_ENDS, DEFAULT_PARAMS, DIP_DTYPE
+from scope_loader import CSV_CH1_COLUMN, CSV_CH2_COLUMN, CSV_TIME_COLUMN, parse_si, read_scope_header
+
+DEFAULT_CHUNKSIZE = 65536
+DEFAULT_HISTORY = 8192
+
+
+def iter_scope_csv(path, chunksize=DEFAULT_CHUNKSIZE):
+    """Yield (time, accelerator_voltage, collector_current) float64 chunks of a scope CSV export."""
+    usecols = [CSV_TIME_COLUMN, CSV_CH1_COLUMN, CSV_CH2_COLUMN]
+    nrows = read_scope_header(path)["record_length"]
+    done = 0
+    try:
+        with pd.read_csv(path, header=None, usecols=usecols, dtype=np.float64,
+                         chunksize=chunksize, nrows=nrows) as reader:
+            for chunk in reader:
+                yield tuple(chunk[col].to_numpy() for col in usecols)
+                done += len(chunk)
+        return
+    except ValueError:
+        pass
+
+    # Values with SI suffixes further down: carry on from where the float reader stopped
+    remaining = None if nrows is None else nrows - done
+    with pd.read_csv(path, header=None, usecols=usecols, dtype=str, chunksize=chunksize,
+                     skiprows=done, nrows=remaining) as reader:
+        for chunk in reader:
+            yield tuple(parse_si(chunk[col].to_numpy()) for col in usecols)
+
+
+class MovingAverage:
+    """Chunk-by-chunk moving_average: keeps the last window_size - 1 samples between calls."""
+
+    def __init__(self, window_size=5):
+        self.window_size = window_size
+        self._kernel = np.ones(window_size) / window_size
+        self._tail = np.empty(0)
+
+    def __call__(self, chunk):
+        data = np.concatenate([self._tail, chunk])
+        if len(data) < self.window_size:
+            self._tail = data
+            return np.empty(0)
+        self._tail = data[len(data) - (self.window_size - 1):]
+        return np.convolve(data, self._kernel, mode="valid")
+
+
+class StreamingDipDetector:
+    """
+    Incremental version of dips.detect_dips for a single trace.
+
+    feed() takes the next voltage/current samples and returns the dips that
+    are settled so far; finish() flushes the rest at the end of the stream.
+    Only the last exclude_ends samples, plus `history` samples of context on
+    each side of the dips still being decided, are kept in memory.
+    """
+
+    def __init__(self, exclude_ends=DEFAULT_EXCLUDE_ENDS, invert=False, history=DEFAULT_HISTORY,
+                 trace=0, index_offset=0, **params):
+        self.exclude_ends = exclude_ends
+        self.invert = invert
+        self.trace = trace
+        self.index_offset = index_offset
+        self.params = {**DEFAULT_PARAMS, "wlen": 2 * history + 1, **params}
+        # Context needed on either side of a dip: its prominence window plus
+        # room for the distance filter to see competing peaks
+        self.margin = self.params["wlen"] // 2 + 2 * int(self.params.get("distance") or 1) + 1
+
+        self._skip = exclude_ends      # leading samples still to drop
+        self._voltage = np.empty(0)    # samples in the detection buffer
+        self._current = np.empty(0)
+        self._start = exclude_ends     # sample index of the first buffered sample
+        self._emitted_until = exclude_ends
+        self._pending_voltage = np.empty(0)  # last exclude_ends samples, held back
+        self._pending_current = np.empty(0)
+        self._dip_count = 0
+        self._last_voltage = np.nan
+
+    def feed(self, voltage, current):
+        """Add samples and return the dips that can no longer change."""
+        voltage = np.asarray(voltage, dtype=np.float64)
+        current = np.asarray(current, dtype=np.float64)
+
+        # Drop the leading exclude_ends samples
+        if self._skip:
+            drop = min(self._skip, len(current))
+            voltage, current = voltage[drop:], current[drop:]
+            self._skip -= drop
+
+        # Hold back the trailing exclude_ends samples until we know the stream goes on
+        pending_voltage = np.concatenate([self._pending_voltage, voltage])
+        pending_current = np.concatenate([self._pending_current, current])
+        release = max(len(pending_current) - self.exclude_ends, 0)
+        self._voltage = np.concatenate([self._voltage, pending_voltage[:release]])
+        self._current = np.concatenate([self._current, pending_current[:release]])
+        self._pending_voltage = pending_voltage[release:]
+        self._pending_current = pending_current[release:]
+
+        return self._scan(final=False)
+
+    def finish(self):
+        """Emit the remaining dips at the end of the stream."""
+        return self._scan(final=True)
+
+    def _scan(self, final):
+        end = self._start + len(self._current)
+        emit_until = end if final else end - self.margin
+        if emit_until <= self._emitted_until:
+            return np.empty(0, dtype=DIP_DTYPE)
+
+        signal = -self._current if self.invert else self._current
+        peaks, _ = scipy.signal.find_peaks(signal, **self.params)
+        peaks = peaks + self._start
+        peaks = peaks[(peaks >= self._emitted_until) & (peaks < emit_until)]
+
+        rows = np.empty(len(peaks), dtype=DIP_DTYPE)
+        local = peaks - self._start
+        rows["trace"] = self.trace
+        rows["dip"] = self._dip_count + np.arange(len(peaks))
+        rows["index"] = peaks + self.index_offset
+        rows["voltage"] = self._voltage[local]
+        rows["current"] = self._current[local]
+        rows["delta_v"] = np.diff(self._voltage[local], prepend=self._last_voltage)
+        if len(peaks):
+            self._dip_count += len(peaks)
+            self._last_voltage = rows["voltage"][-1]
+
+        # Keep only the context later dips can still depend on
+        self._emitted_until = emit_until
+        keep_from = max(emit_until - self.margin, self._start)
+        self._voltage = self._voltage[keep_from - self._start:]
+        self._current = self._current[keep_from - self._start:]
+        self._start = keep_from
+        return rows
+
+
+def stream_dips(path, chunksize=DEFAULT_CHUNKSIZE, smooth_window=None, **detector_kwargs):
+    """
+    Yield dips of a scope CSV export chunk by chunk, with bounded memory.
+
+    With smooth_window the current goes through MovingAverage first. Smoothed
+    sample k averages raw samples k .. k + smooth_window - 1 and is paired with
+    the voltage of raw sample k + smooth_window - 1; reported indices are raw
+    sample indices.
+    """
+    smoother = MovingAverage(smooth_window) if smooth_window else None
+    lag = smooth_window - 1 if smooth_window else 0
+    detector = StreamingDipDetector(index_offset=lag, **detector_kwargs)
+
+    voltage_skip = lag
+    for _, voltage, current in iter_scope_csv(path, chunksize):
+        if smoother is not None:
+            current = smoother(current)
+            drop = min(voltage_skip, len(voltage))
+            voltage, voltage_skip = voltage[drop:], voltage_skip - drop
+        rows = detector.feed(voltage, current)
+        if len(rows):
+            yield rows
+
+    rows = detector.finish()
+    if len(rows):
+        yield rows
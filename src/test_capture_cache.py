@@ -0,0 +1,44 @@
+"""Tests for CaptureCache: concurrent writers of one entry."""
+
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from capture_cache import CaptureCache
+from ingest import ingest_sweep
+from scope_loader import load_capture
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_concurrent_put_of_one_capture(tmp_path):
+    source = tmp_path / "110.xlsx"
+    shutil.copy(os.path.join(HERE, "110.xlsx"), source)
+    capture = load_capture(str(source))
+    cache = CaptureCache(str(tmp_path / "cache"))
+
+    n_writers = 16
+    barrier = threading.Barrier(n_writers)
+
+    def put():
+        barrier.wait()
+        for _ in range(5):
+            cache.put(str(source), capture)
+
+    with ThreadPoolExecutor(n_writers) as pool:
+        for future in [pool.submit(put) for _ in range(n_writers)]:
+            future.result()
+
+    cached = cache.get(str(source))
+    np.testing.assert_array_equal(cached.collector_current, capture.collector_current)
+    assert sorted(os.listdir(cache.cache_dir)) == sorted(os.path.basename(p) for p in cache._entry_paths(str(source)))
+
+
+def test_parallel_ingest_of_one_capture(tmp_path):
+    source = tmp_path / "110.xlsx"
+    shutil.copy(os.path.join(HERE, "110.xlsx"), source)
+    sweep = ingest_sweep([str(source)] * 8, workers=8, cache_dir=str(tmp_path / "cache"))
+    assert len(sweep) == 8
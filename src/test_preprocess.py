@@ -0,0 +1,21 @@
+"""Tests for in-place preprocessing of ragged sweeps with empty traces."""
+
+import numpy as np
+
+from preprocess import fill_nan_, shift_baseline_
+
+
+def test_fill_nan_and_baseline_with_empty_traces():
+    # Traces: [], [1, nan, 3], [], [5, nan], [7, nan], []
+    data = np.array([1, np.nan, 3, 5, np.nan, 7, np.nan])
+    offsets = [0, 0, 3, 3, 5, 7, 7]
+    fill_nan_(data, offsets)
+    np.testing.assert_array_equal(data, [1, 2, 3, 5, 5, 7, 7])
+    shift_baseline_(data, offsets)
+    np.testing.assert_array_equal(data, [0, 1, 2, 0, 0, 0, 0])
+
+
+def test_fill_nan_all_nan_trace_stays_nan():
+    data = np.array([np.nan, np.nan, 1.0])
+    fill_nan_(data, [0, 2, 3])
+    assert np.isnan(data[:2]).all() and data[2] == 1.0
@@ -0,0 +1,58 @@
+"""Tests for ResultsIndex.update: results are analysed and stored with the caller's settings."""
+
+import functools
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from pipeline import DEFAULT_SETTINGS, analyse_paths
+from results_index import ResultsIndex
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+@pytest.fixture
+def capture(tmp_path):
+    path = tmp_path / "140.xlsx"
+    shutil.copy(os.path.join(HERE, "140.xlsx"), path)
+    return str(path)
+
+
+@pytest.fixture
+def index(tmp_path):
+    with ResultsIndex(str(tmp_path / "results.sqlite")) as index:
+        yield index
+
+
+@pytest.fixture
+def analyse(tmp_path):
+    # Keep parsed captures out of the repository's own cache
+    return functools.partial(analyse_paths, workers=1, cache_dir=str(tmp_path / "cache"))
+
+
+def stored_dips(index):
+    return index.dips()["voltage"].to_numpy()
+
+
+def test_update_analyses_with_settings(index, capture, analyse):
+    settings = {"prominence": 0.5}
+    assert index.update([capture], analyse, settings) == [capture]
+
+    # Same dips as analysing directly with those settings, not with the defaults
+    (_, _, expected, _), = analyse([capture], settings)
+    (_, _, default, _), = analyse([capture])
+    assert len(expected) != len(default)
+    np.testing.assert_allclose(stored_dips(index), expected["voltage"])
+
+    assert index.update([capture], analyse, settings) == []
+    assert index.update([capture], analyse) == [capture]
+    np.testing.assert_allclose(stored_dips(index), default["voltage"])
+
+
+def test_default_settings_share_one_key(index, capture, analyse):
+    index.update([capture], analyse)
+    assert index.is_current(capture, {})
+    assert index.is_current(capture, dict(DEFAULT_SETTINGS))
+    assert not index.is_current(capture, {"prominence": 0.5})
@@ -0,0 +1,27 @@
+"""Tests for parse_si: SI suffixes, the micro sign and non-ASCII input."""
+
+import numpy as np
+import pytest
+
+from scope_loader import parse_si
+
+
+def test_parse_si_prefixes():
+    np.testing.assert_allclose(parse_si(["2.5m", "40u", "1.5", "-3k"]), [2.5e-3, 40e-6, 1.5, -3e3])
+
+
+@pytest.mark.parametrize("micro", ["µ", "μ"])
+def test_parse_si_micro_sign(micro):
+    np.testing.assert_allclose(parse_si([f"40{micro}", "1"]), [40e-6, 1.0])
+
+
+def test_parse_si_unparseable_is_nan():
+    out = parse_si(["1m", "abc"])
+    assert out[0] == pytest.approx(1e-3)
+    assert np.isnan(out[1])
+
+
+@pytest.mark.parametrize("value", ["2€", "é1.0"])
+def test_parse_si_other_non_ascii_raises_value_error(value):
+    with pytest.raises(ValueError):
+        parse_si(["1.0", value])
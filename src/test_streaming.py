@@ -0,0 +1,52 @@
+"""Tests for streaming detection: stream_dips gives exactly the dips of the in-memory path."""
+
+import numpy as np
+import pytest
+
+from bench_dips import synthetic_sweep
+from dips import detect_dips
+from scope_loader import Capture, read_scope_csv, write_scope_csv
+from streaming import DEFAULT_HISTORY, stream_dips
+
+N_SAMPLES = 2_500
+EXCLUDE_ENDS = 200
+
+
+@pytest.fixture(scope="module")
+def capture_path(tmp_path_factory):
+    voltage, current = synthetic_sweep(1, N_SAMPLES, seed=3)
+    path = str(tmp_path_factory.mktemp("streaming") / "synthetic.csv")
+    write_scope_csv(path, Capture(path, np.arange(N_SAMPLES) * 4e-4, voltage[0], current[0],
+                                  {"sample_interval": 4e-4}))
+    return path
+
+
+def in_memory_dips(path, smooth_window, invert):
+    """The whole record smoothed with np.convolve(mode='valid') and run through detect_dips."""
+    capture = read_scope_csv(path)
+    voltage, current = capture.accelerator_voltage, capture.collector_current
+    lag = smooth_window - 1 if smooth_window else 0
+    if smooth_window:
+        current = np.convolve(current, np.ones(smooth_window) / smooth_window, mode="valid")
+        voltage = voltage[lag:]
+    table = detect_dips(voltage, current, exclude_ends=EXCLUDE_ENDS, invert=invert, wlen=2 * DEFAULT_HISTORY + 1)
+    table["index"] += lag
+    return table
+
+
+# Chunk sizes include 1 and sizes below the smoothing window
+@pytest.mark.parametrize("chunksize", [1, 3, 4, 7, 100, 4096])
+@pytest.mark.parametrize("smooth_window", [None, 5])
+@pytest.mark.parametrize("invert", [False, True])
+def test_stream_dips_matches_in_memory(capture_path, chunksize, smooth_window, invert):
+    expected = in_memory_dips(capture_path, smooth_window, invert)
+    chunks = list(stream_dips(capture_path, chunksize=chunksize, smooth_window=smooth_window,
+                              exclude_ends=EXCLUDE_ENDS, invert=invert))
+    streamed = np.concatenate(chunks) if chunks else np.empty(0, dtype=expected.dtype)
+
+    assert len(expected) > 0
+    np.testing.assert_array_equal(streamed["dip"], expected["dip"])
+    np.testing.assert_array_equal(streamed["index"], expected["index"])
+    np.testing.assert_array_equal(streamed["voltage"], expected["voltage"])
+    np.testing.assert_array_equal(streamed["current"], expected["current"])
+    np.testing.assert_array_equal(streamed["delta_v"], expected["delta_v"])